@@ -9,7 +9,8 @@ en tiempo real, similar a n8n, donde se puede observar el flujo de ejecución.
 ARQUITECTURA:
 - Flask: Servidor HTTP para endpoints REST y servir frontend
 - Socket.IO: Comunicación bidireccional en tiempo real
-- Threading: Ejecución de crew en background para no bloquear UI
+- Eventlet: Greenlets cooperativos para multiplexar conexiones WebSocket
+  y ejecutar la crew en background sin bloquear la UI
 
 ENDPOINTS:
 - GET /              : Dashboard principal
@@ -17,39 +18,94 @@ ENDPOINTS:
 - WS /agents         : Namespace Socket.IO para eventos en vivo
 """
 
+# eventlet debe parchear la stdlib ANTES de cualquier otra importación para
+# que sockets, threading y time cedan el control cooperativamente
+import eventlet
+
+eventlet.monkey_patch()
+
+import atexit
 import os
+import queue
+import sys
 import uuid
-from flask import Flask, render_template, request as flask_request, jsonify
+import orjson
+from eventlet import tpool
+from flask import (
+    Flask,
+    Response,
+    render_template,
+    request as flask_request,
+    jsonify,
+)
 from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
 from dotenv import load_dotenv
 import logging
-from threading import Thread
+from logging.handlers import QueueHandler, QueueListener
 from datetime import datetime
 
 # Importaciones locales
 from src.crew import generate_news_article
-from src.callbacks import set_socketio
+from src.callbacks import set_socketio, get_callback_handler
 from src.formatting import format_news_article
+from src.session_store import create_session_store
+from src.json_provider import ORJSONModule, ORJSONProvider
+
+# Cargar variables de entorno
+load_dotenv()
+
+# Configuración leída una sola vez al importar
+DEBUG = os.getenv("FLASK_DEBUG", "False").lower() == "true"
+PORT = int(os.getenv("FLASK_PORT", 8080))
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()  # WARNING en producción
+CORS_ORIGINS = os.getenv("CORS_ORIGINS", "*").split(",")
+
+# Cola de mensajes compartida entre workers de Gunicorn (Redis pub/sub).
+# Sin REDIS_URL, Socket.IO funciona en modo de proceso único.
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Ejecutar la crew en workers Celery (ver tasks.py) en lugar del proceso web
+CELERY_ENABLED = os.getenv("CELERY_ENABLED", "False").lower() == "true"
+
+# Sin REDIS_URL los eventos Socket.IO del worker Celery nunca llegarían al
+# proceso web (no hay message_queue) y tasks.py usaría un broker en localhost
+if CELERY_ENABLED and not REDIS_URL:
+    raise RuntimeError("CELERY_ENABLED=True requiere REDIS_URL")
+
+# Configurar logging: los módulos solo encolan el registro y un hilo de fondo
+# lo escribe en stderr, fuera del camino de las peticiones y de la crew.
+# queue.Queue (no SimpleQueue) para que eventlet pueda ceder en el get()
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(
+    logging.Formatter("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+)
+_log_listener = QueueListener(_log_queue, _log_stream, respect_handler_level=True)
+_log_listener.start()
+atexit.register(_log_listener.stop)
 
-# Configurar logging
+# force=True: src.llm_config ya configuró el root al importarse. El formato
+# real lo aplica _log_stream; el QueueHandler solo interpola el mensaje
 logging.basicConfig(
-    level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    level=LOG_LEVEL,
+    format="%(message)s",
+    handlers=[QueueHandler(_log_queue)],
+    force=True,
 )
 logger = logging.getLogger(__name__)
 
-# Cargar variables de entorno
-load_dotenv()
-
 # =============================================================================
 # CONFIGURACIÓN DE FLASK Y SOCKET.IO
 # =============================================================================
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 app.config["SECRET_KEY"] = os.getenv(
     "FLASK_SECRET_KEY", "dev-secret-key-change-in-production"
 )
-app.config["DEBUG"] = os.getenv("FLASK_DEBUG", "True").lower() == "true"
+# Debug solo si se habilita explícitamente
+app.config["DEBUG"] = DEBUG
 
 # Habilitar CORS para desarrollo
 CORS(app)
@@ -57,26 +113,28 @@ CORS(app)
 # Inicializar Socket.IO
 socketio = SocketIO(
     app,
-    cors_allowed_origins="*",  # En producción, especificar dominios permitidos
-    async_mode="threading",
-    logger=True,
+    # En producción, especificar dominios permitidos (separados por coma)
+    cors_allowed_origins=CORS_ORIGINS,
+    async_mode="eventlet",
+    message_queue=REDIS_URL,
+    json=ORJSONModule,  # Paquetes Socket.IO codificados con orjson
+    logger=False,
     engineio_logger=False,
 )
 
 # Inyectar Socket.IO en el sistema de callbacks
-set_socketio(socketio)
+# Sin cola de mensajes la crew corre en este proceso y puede consultar las
+# rooms locales para no generar agent_thinking de sesiones sin observadores
+set_socketio(socketio, track_subscribers=REDIS_URL is None)
 
 logger.info("✅ Flask y Socket.IO inicializados")
 
 # =============================================================================
-# ALMACENAMIENTO EN MEMORIA (Para demo - usar DB en producción)
+# ALMACENAMIENTO DE SESIONES (Redis con TTL, memoria como fallback)
 # =============================================================================
 
-# Diccionario para almacenar sesiones activas
-active_sessions = {}
-
-# Diccionario para almacenar resultados
-results_cache = {}
+# Sesiones activas y resultados, con expiración automática
+session_store = create_session_store(REDIS_URL)
 
 
 # =============================================================================
@@ -84,6 +142,11 @@ results_cache = {}
 # =============================================================================
 
 
+def _json_response(payload, status: int = 200) -> Response:
+    """Serializa directamente a bytes con orjson (sin pasar por jsonify)."""
+    return Response(orjson.dumps(payload), status=status, mimetype="application/json")
+
+
 @app.route("/")
 def index():
     """
@@ -97,11 +160,11 @@ def health_check():
     """
     Endpoint de health check para monitoreo.
     """
-    return jsonify(
+    return _json_response(
         {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
-            "active_sessions": len(active_sessions),
+            "active_sessions": session_store.count(),
         }
     )
 
@@ -114,7 +177,7 @@ def generate_article():
     FLUJO:
     1. Recibe tema por POST
     2. Genera session_id único
-    3. Lanza crew en thread separado (no bloquea)
+    3. Lanza crew en greenlet de background o la encola en Celery (no bloquea)
     4. Retorna session_id al cliente
     5. Cliente se suscribe a eventos Socket.IO con ese session_id
 
@@ -154,18 +217,29 @@ def generate_article():
         session_id = str(uuid.uuid4())
 
         # Registrar sesión
-        active_sessions[session_id] = {
-            "topic": topic,
-            "started_at": datetime.now().isoformat(),
-            "status": "running",
-        }
+        session_store.create_session(
+            session_id,
+            {
+                "topic": topic,
+                "started_at": datetime.now().isoformat(),
+                "status": "running",
+            },
+        )
 
-        logger.info(f"🚀 Nueva sesión iniciada: {session_id} | Tema: '{topic}'")
+        logger.info("🚀 Nueva sesión iniciada: %s | Tema: '%s'", session_id, topic)
 
-        # Lanzar generación en thread separado
-        thread = Thread(target=run_crew_async, args=(topic, session_id))
-        thread.daemon = True
-        thread.start()
+        current_date = datetime.now().strftime("%Y-%m-%d")
+
+        if CELERY_ENABLED:
+            # Encolar en los workers Celery (sobrevive a reinicios del web)
+            from tasks import run_crew_task
+
+            run_crew_task.delay(topic, session_id, current_date)
+        else:
+            # Lanzar generación en un greenlet (cede el control durante I/O de red)
+            socketio.start_background_task(
+                run_crew_async, topic, session_id, current_date
+            )
 
         return (
             jsonify(
@@ -180,7 +254,7 @@ def generate_article():
         )  # 202 Accepted
 
     except Exception as e:
-        logger.error(f"❌ Error en /api/generate: {e}")
+        logger.error("❌ Error en /api/generate: %s", e)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
@@ -200,21 +274,21 @@ def get_result(session_id):
             ...
         }
     """
-    if session_id not in active_sessions:
-        return jsonify({"status": "error", "message": "Sesión no encontrada"}), 404
-
-    session_info = active_sessions[session_id]
+    # Si está en cache de resultados, retornar (el resultado vive más que la sesión)
+    result = session_store.get_result(session_id)
+    if result is not None:
+        return _json_response(result)
 
-    # Si está en cache de resultados, retornar
-    if session_id in results_cache:
-        return jsonify(results_cache[session_id])
+    session_info = session_store.get_session(session_id)
+    if session_info is None:
+        return jsonify({"status": "error", "message": "Sesión no encontrada"}), 404
 
     # Si aún está corriendo
-    return jsonify(
+    return _json_response(
         {
-            "status": session_info["status"],
-            "topic": session_info["topic"],
-            "started_at": session_info["started_at"],
+            "status": session_info.get("status"),
+            "topic": session_info.get("topic"),
+            "started_at": session_info.get("started_at"),
         }
     )
 
@@ -225,14 +299,21 @@ def get_result(session_id):
 
 
 @socketio.on("connect", namespace="/agents")
-def handle_connect():
+def handle_connect(auth=None):
     """
     Maneja conexión de cliente al namespace /agents.
+
+    Si el handshake incluye `auth.session_id` (p. ej. al reconectar durante
+    una generación), el socket se une directamente a la room de esa sesión:
+    los eventos se emiten por room y solo llegan a sus suscriptores.
     """
-    from flask import request
+    sid = getattr(flask_request, "sid", "unknown")
+    logger.info("🔌 Cliente conectado: %s", sid)
 
-    sid = request.sid if hasattr(request, "sid") else "unknown"  # type: ignore[attr-defined]
-    logger.info(f"🔌 Cliente conectado: {sid}")
+    session_id = (auth or {}).get("session_id")
+    if session_id and session_store.get_session(session_id) is not None:
+        join_room(session_id)
+        logger.info("👥 Cliente %s se unió a sesión %s", sid, session_id)
     emit(
         "connected",
         {"message": "Conectado al sistema multiagente", "sid": sid},
@@ -244,10 +325,8 @@ def handle_disconnect():
     """
     Maneja desconexión de cliente.
     """
-    from flask import request
-
-    sid = request.sid if hasattr(request, "sid") else "unknown"  # type: ignore[attr-defined]
-    logger.info(f"🔌 Cliente desconectado: {sid}")
+    sid = getattr(flask_request, "sid", "unknown")
+    logger.info("🔌 Cliente desconectado: %s", sid)
 
 
 @socketio.on("join_session", namespace="/agents")
@@ -264,23 +343,29 @@ def handle_join_session(data):
         emit("error", {"message": "session_id requerido"})
         return
 
-    if session_id not in active_sessions:
+    session_info = session_store.get_session(session_id)
+    if session_info is None:
         emit("error", {"message": "Sesión no encontrada"})
         return
 
     # Unir cliente a room de la sesión
     join_room(session_id)
 
-    from flask import request
-
-    sid = request.sid if hasattr(request, "sid") else "unknown"  # type: ignore[attr-defined]
-    logger.info(f"👥 Cliente {sid} se unió a sesión {session_id}")
+    sid = getattr(flask_request, "sid", "unknown")
+    logger.info("👥 Cliente %s se unió a sesión %s", sid, session_id)
 
     emit(
         "joined_session",
-        {"session_id": session_id, "topic": active_sessions[session_id]["topic"]},
+        {"session_id": session_id, "topic": session_info.get("topic")},
     )
 
+    # Si la sesión terminó antes de que el cliente se uniera (p. ej. artículo
+    # servido desde la cache de temas), generation_complete ya se emitió a una
+    # room vacía: reenviarlo a este cliente
+    result = session_store.get_result(session_id)
+    if result is not None:
+        emit("generation_complete", result)
+
 
 @socketio.on("ping", namespace="/agents")
 def handle_ping():
@@ -295,22 +380,23 @@ def handle_ping():
 # =============================================================================
 
 
-def run_crew_async(topic: str, session_id: str):
+def run_crew_async(topic: str, session_id: str, current_date: str = ""):
     """
-    Ejecuta la crew en un thread separado y emite resultado al finalizar.
+    Ejecuta la crew (en un greenlet de background o en un worker Celery) y
+    emite resultado al finalizar.
 
     Args:
         topic: Tema de la noticia
         session_id: ID de la sesión
+        current_date: Fecha de referencia (YYYY-MM-DD). Si vacía, usa hoy
     """
     try:
-        logger.info(f"🎬 Iniciando crew para sesión {session_id}")
+        logger.info("🎬 Iniciando crew para sesión %s", session_id)
 
         # Obtener fecha actual
-        from datetime import datetime
-
-        current_date = datetime.now().strftime("%Y-%m-%d")
-        logger.info(f"📅 Fecha de referencia del sistema: {current_date}")
+        if not current_date:
+            current_date = datetime.now().strftime("%Y-%m-%d")
+        logger.info("📅 Fecha de referencia del sistema: %s", current_date)
 
         # Ejecutar crew (esto lanzará eventos Socket.IO automáticamente)
         result = generate_news_article(topic, session_id, current_date)
@@ -319,28 +405,37 @@ def run_crew_async(topic: str, session_id: str):
         if result.get("status") == "success" and result.get("article"):
             try:
                 logger.info("🧹 Aplicando formateo de limpieza al artículo...")
-                result["article"] = format_news_article(result["article"])
+                # Formateo CPU-bound: ejecutarlo en el pool de threads nativos
+                # para no bloquear el hub de eventlet
+                result["article"] = tpool.execute(
+                    format_news_article, result["article"]
+                )
             except Exception as e:
-                logger.warning(f"⚠️ Error al formatear artículo: {e}")
+                logger.warning("⚠️ Error al formatear artículo: %s", e)
                 # Continuamos con el artículo original si falla el formateo
 
         # Actualizar estado de sesión
-        active_sessions[session_id]["status"] = result["status"]
-        active_sessions[session_id]["finished_at"] = datetime.now().isoformat()
+        session_store.update_session(
+            session_id,
+            status=result["status"],
+            finished_at=datetime.now().isoformat(),
+        )
 
         # Guardar en cache
-        results_cache[session_id] = result
+        session_store.set_result(session_id, result)
 
-        # Emitir evento final
+        # Vaciar eventos pendientes para preservar el orden, y emitir evento final
+        get_callback_handler(session_id).flush()
         socketio.emit("generation_complete", result, namespace="/agents", to=session_id)
 
-        logger.info(f"✅ Sesión {session_id} completada: {result['status']}")
+        logger.info("✅ Sesión %s completada: %s", session_id, result["status"])
 
     except Exception as e:
         error_msg = f"Error en crew async: {str(e)}"
-        logger.error(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
 
         # Emitir error
+        get_callback_handler(session_id).flush()
         socketio.emit(
             "generation_error",
             {"session_id": session_id, "error": error_msg},
@@ -349,8 +444,7 @@ def run_crew_async(topic: str, session_id: str):
         )
 
         # Actualizar sesión
-        active_sessions[session_id]["status"] = "error"
-        active_sessions[session_id]["error"] = error_msg
+        session_store.update_session(session_id, status="error", error=error_msg)
 
 
 # =============================================================================
@@ -358,26 +452,22 @@ def run_crew_async(topic: str, session_id: str):
 # =============================================================================
 
 if __name__ == "__main__":
-    port = int(os.getenv("FLASK_PORT", 8080))
-    debug = os.getenv("FLASK_DEBUG", "True").lower() == "true"
-
-    print("=" * 80)
-    print("🚀 SISTEMA MULTIAGENTE DE PRODUCCIÓN DE NOTICIAS")
-    print("=" * 80)
-    print(f"\n📍 Dashboard disponible en: http://localhost:{port}")
-    print(f"🔌 Socket.IO namespace: /agents")
-    print(f"🐛 Modo Debug: {debug}")
-    print("\n" + "=" * 80 + "\n")
-    print("⚠️  REQUERIMIENTOS ANTES DE USAR:")
-    print("  1. API_RALF debe estar corriendo (ver .env)")
-    print("  2. ScraperRalf debe estar en http://localhost:5000")
-    print("\n" + "=" * 80 + "\n")
-
-    # Iniciar servidor
-    socketio.run(
-        app,
-        host="0.0.0.0",
-        port=port,
-        debug=debug,
-        allow_unsafe_werkzeug=True,  # Solo para desarrollo
+    # Banner de arranque en una sola escritura a stdout
+    bar = "=" * 80
+    sys.stdout.write(
+        f"{bar}\n"
+        "🚀 SISTEMA MULTIAGENTE DE PRODUCCIÓN DE NOTICIAS\n"
+        f"{bar}\n"
+        f"\n📍 Dashboard disponible en: http://localhost:{PORT}\n"
+        "🔌 Socket.IO namespace: /agents\n"
+        f"🐛 Modo Debug: {DEBUG}\n"
+        f"\n{bar}\n\n"
+        "⚠️  REQUERIMIENTOS ANTES DE USAR:\n"
+        "  1. API_RALF debe estar corriendo (ver .env)\n"
+        "  2. ScraperRalf debe estar en http://localhost:5000\n"
+        f"\n{bar}\n\n"
     )
+
+    # Iniciar servidor (usa eventlet.wsgi.server con async_mode="eventlet").
+    # En producción usar: gunicorn -c gunicorn_conf.py app:app
+    socketio.run(app, host="0.0.0.0", port=PORT, debug=DEBUG)
@@ -1,32 +1,42 @@
 import re
 import os
+from pathlib import Path
+
+# Patrones compilados una sola vez al importar el módulo
+_PAT_WS = re.compile(r"\s+")
+_PAT_BOLD = re.compile(r"\*\*")
+# Saltos de línea antes de encabezados, citas, listas y separadores (una pasada)
+# Un grupo por tipo de marcador: match.lastindex identifica el tipo
+_PAT_BLOCK_START = re.compile(r"(?<=[^\n])(?:(#+ )|(> )|(- \*\*)|(- [A-Z])|(---))")
+_PAT_SEP_AFTER = re.compile(r"(---) ?([^\n])")
+_PAT_CAMEL = re.compile(r"([a-záéíóúñ])([A-ZÁÉÍÓÚÑ])")
+_PAT_MULTINL = re.compile(r"\n{3,}")
+
+_MARKER = "Final Output:"
 
-def extract_text(file_path):
-    with open(file_path, "r", encoding="utf-8") as f:
-        lines = f.readlines()
 
+def extract_text(file_path):
     extracted_lines = []
     capture = False
-    
-    for line in lines:
-        stripped = line.strip()
-        
-        if "Final Output:" in line:
-            capture = True
-            parts = line.split("Final Output:")
-            if len(parts) > 1:
-                content = parts[1].strip()
-                content = content.replace("│", "").strip()
-                extracted_lines.append(content)
-            continue
-            
-        if capture:
-            if "╰" in line:
-                break
-            
-            content = stripped.replace("│", "").strip()
-            if content:
-                extracted_lines.append(content)
+
+    # Iterar el archivo línea a línea (memoria constante) en lugar de readlines()
+    with open(file_path, "r", encoding="utf-8", buffering=1 << 16) as f:
+        for line in f:
+            idx = line.find(_MARKER)
+            if idx >= 0:
+                capture = True
+                content = line[idx + len(_MARKER):].replace("│", "").strip()
+                if content:
+                    extracted_lines.append(content)
+                continue
+
+            if capture:
+                if "╰" in line:
+                    break
+
+                content = line.replace("│", "").strip()
+                if content:
+                    extracted_lines.append(content)
 
     full_text = " ".join(extracted_lines)
     return full_text
@@ -36,61 +46,66 @@ def fix_bold_spacing(text):
     Corrige el espaciado alrededor de marcadores de negrita (**).
     Usa isalnum() para decidir si separar, evitando separar puntuación.
     """
-    parts = text.split("**")
-    if len(parts) < 2:
-        return text
-        
-    result = []
-    for i in range(len(parts)):
-        part = parts[i]
-        result.append(part)
-        
-        if i < len(parts) - 1:
-            prev_char = part[-1] if part else ""
-            next_char = parts[i+1][0] if parts[i+1] else ""
-            
-            sep = "**"
-            
-            if i % 2 == 0: # Abriendo negrita (Plain -> Bold)
-                # Separar si el caracter anterior es alfanumérico (pegado a palabra)
-                if prev_char.isalnum():
-                    sep = "\n\n**"
-            else: # Cerrando negrita (Bold -> Plain)
-                # Separar si el caracter siguiente es alfanumérico (pegado a palabra)
-                # Esto mantiene la puntuación pegada a la negrita (ej: **Bold**:)
-                if next_char.isalnum():
-                    sep = "**\n\n"
-            
-            result.append(sep)
-            
-    return "".join(result)
+    # Los marcadores alternan apertura/cierre; el estado se lleva en el
+    # callback y el recorrido lo hace el motor de regex (sin split/join)
+    opening = True
+
+    def _separate(match):
+        nonlocal opening
+        pos = match.start()
+        end = match.end()
+        if opening:  # Abriendo negrita (Plain -> Bold)
+            # Separar si el caracter anterior es alfanumérico (pegado a palabra)
+            sep = "\n\n**" if pos > 0 and text[pos - 1].isalnum() else "**"
+        else:  # Cerrando negrita (Bold -> Plain)
+            # Separar si el caracter siguiente es alfanumérico (pegado a palabra)
+            # Esto mantiene la puntuación pegada a la negrita (ej: **Bold**:)
+            sep = "**\n\n" if end < len(text) and text[end].isalnum() else "**"
+        opening = not opening
+        return sep
+
+    return _PAT_BOLD.sub(_separate, text)
+
+def break_before_blocks(text):
+    """
+    Inserta un salto de párrafo antes de cada marcador de bloque pegado a
+    texto. Un marcador pegado al anterior de su mismo tipo ("> > cita",
+    "# # Título", "- A- B") sigue en la misma línea, como en el formateo
+    original de una pasada por tipo.
+    """
+    last_kind = 0
+    last_end = -1
+
+    def _split(match):
+        nonlocal last_kind, last_end
+        kind = match.lastindex
+        if kind == last_kind and match.start() == last_end:
+            last_kind = 0
+            return match.group()
+        last_kind, last_end = kind, match.end()
+        return "\n\n" + match.group()
+
+    return _PAT_BLOCK_START.sub(_split, text)
 
 def format_news_article(raw_text):
     # 0. Normalizar espacios
-    formatted = re.sub(r"\s+", " ", raw_text)
-    
-    # 1. Asegurar saltos de línea antes de los encabezados (##, ###)
-    formatted = re.sub(r"([^\n])(#+ )", r"\1\n\n\2", formatted)
-    
-    # 2. Asegurar saltos de línea antes de citas (>)
-    formatted = re.sub(r"([^\n])(> )", r"\1\n\n\2", formatted)
+    formatted = _PAT_WS.sub(" ", raw_text)
     
-    # 3. Asegurar saltos de línea antes de listas (-)
-    formatted = re.sub(r"([^\n])(- \*\*)", r"\1\n\n\2", formatted)
-    formatted = re.sub(r"([^\n])(- [A-Z])", r"\1\n\n\2", formatted)
+    # 1. Asegurar saltos de línea antes de encabezados (##), citas (>),
+    #    listas (-) y la sección de fuentes (---) en una sola pasada
+    formatted = break_before_blocks(formatted)
     
-    # 4. Corregir espaciado de negritas
+    # 2. Corregir espaciado de negritas
     formatted = fix_bold_spacing(formatted)
     
-    # 5. Separar la sección de fuentes (---)
-    formatted = re.sub(r"([^\n])(---)", r"\1\n\n\2", formatted)
-    formatted = re.sub(r"(---)([^\n])", r"\1\n\n\2", formatted)
+    # 3. Separar la sección de fuentes (---) del texto siguiente
+    formatted = _PAT_SEP_AFTER.sub(r"\1\n\n\2", formatted)
 
-    # 6. Separar texto pegado (CamelCase accidental: "HechosLa", "VenezuelaLa")
-    formatted = re.sub(r"([a-záéíóúñ])([A-ZÁÉÍÓÚÑ])", r"\1\n\n\2", formatted)
+    # 4. Separar texto pegado (CamelCase accidental: "HechosLa", "VenezuelaLa")
+    formatted = _PAT_CAMEL.sub(r"\1\n\n\2", formatted)
     
-    # 7. Limpieza general
-    formatted = re.sub(r"\n{3,}", "\n\n", formatted)
+    # 5. Limpieza general
+    formatted = _PAT_MULTINL.sub("\n\n", formatted)
     
     return formatted
 
@@ -110,7 +125,6 @@ if __name__ == "__main__":
         
     formatted_text = format_news_article(raw_text)
     
-    with open(output_file, "w", encoding="utf-8") as f:
-        f.write(formatted_text)
+    Path(output_file).write_text(formatted_text, encoding="utf-8")
         
     print(f"Resultado guardado en: {output_file}")
@@ -0,0 +1,39 @@
+"""
+=============================================================================
+CONFIGURACIÓN DE GUNICORN PARA PRODUCCIÓN
+=============================================================================
+
+Reemplaza el servidor de desarrollo (socketio.run) por un worker de
+eventlet. Flask-SocketIO requiere un único worker por instancia de
+Gunicorn: Gunicorn no puede enrutar las peticiones de un cliente Socket.IO
+siempre al mismo worker y el handshake por polling fallaría.
+
+ESCALADO:
+- N instancias de Gunicorn de un worker cada una, en puertos distintos
+  (FLASK_PORT), detrás de nginx con ip_hash (sesiones "sticky")
+- Redis accesible en REDIS_URL: las instancias comparten sesiones,
+  resultados y los eventos de Socket.IO (emit a rooms) mediante pub/sub
+
+Uso:
+    gunicorn -c gunicorn_conf.py app:app
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('FLASK_PORT', '8080')}"
+
+# Un único hub de eventlet: escalar con más instancias, no con más workers
+workers = int(os.getenv("GUNICORN_WORKERS", "1"))
+if workers > 1 and not os.getenv("REDIS_URL"):
+    # Cada worker tendría su propio almacén de sesiones y sus propios sockets
+    raise RuntimeError("GUNICORN_WORKERS > 1 requiere REDIS_URL")
+worker_class = "eventlet"
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "2000"))
+
+# Las conexiones WebSocket son de larga duración
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+keepalive = 5
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
@@ -4,15 +4,22 @@ Este servidor se ejecuta localmente y traduce las peticiones.
 """
 
 from flask import Flask, request, Response, stream_with_context
+import codecs
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
+import orjson
 import os
 import time
-import random
 from dotenv import load_dotenv
 from typing import Dict, Any, Tuple, Optional
 import logging
 
+from src.cache import LRUCache
+from src.json_provider import ORJSONProvider
+
 load_dotenv()
 
 # Configurar logging
@@ -22,6 +29,15 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
+
+# Tamaño de bloque al reenviar el stream de RALF (un chunk SSE por bloque)
+STREAM_CHUNK_SIZE = int(os.getenv("RALF_STREAM_CHUNK_SIZE", "4096"))
+
+# Chunk SSE en formato OpenAI pre-serializado alrededor del contenido:
+# data: {"choices":[{"delta":{"content":<texto>},"index":0,"finish_reason":null}]}
+_SSE_CHUNK_PREFIX = b'data: {"choices":[{"delta":{"content":'
+_SSE_CHUNK_SUFFIX = b'},"index":0,"finish_reason":null}]}\n\n'
 
 RALF_ENDPOINT = os.getenv(
     "RALF_ENDPOINT", "http://ygggo88wk0wo8ogckoscgw0o.72.62.170.143.sslip.io/chat"
@@ -31,64 +47,104 @@ RALF_ENDPOINT = os.getenv(
 MAX_RETRIES = int(os.getenv("RALF_MAX_RETRIES", "5"))
 BASE_DELAY = float(os.getenv("RALF_BASE_DELAY", "2.0"))  # segundos
 MAX_DELAY = float(os.getenv("RALF_MAX_DELAY", "60.0"))  # segundos
-JITTER_RANGE = float(os.getenv("RALF_JITTER_RANGE", "0.5"))  # +/- 50%
 
 
-def call_ralf_with_retry(
-    ralf_payload: Dict[str, Any], stream: bool = False, timeout: int = 60
-) -> Tuple[Optional[requests.Response], Optional[Dict[str, Any]]]:
+class _CappedRetry(Retry):
+    """Retry que también limita el Retry-After del servidor a MAX_DELAY."""
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else min(retry_after, MAX_DELAY)
+
+
+# Reintentos con backoff exponencial gestionados por urllib3: respeta el
+# header Retry-After del servidor en 429/503 en lugar de esperar a ciegas,
+# con toda espera (backoff o Retry-After) acotada a MAX_DELAY
+_retry = _CappedRetry(
+    total=MAX_RETRIES - 1,  # MAX_RETRIES cuenta también el intento inicial
+    backoff_factor=BASE_DELAY,
+    backoff_max=MAX_DELAY,
+    status_forcelist=(429, 500, 502, 503, 504),
+    allowed_methods=frozenset({"POST"}),
+    respect_retry_after_header=True,
+    raise_on_status=False,  # Devolver la última respuesta para reportar el error
+)
+
+# Sesión HTTP compartida: reutiliza conexiones TCP/TLS entre peticiones y reintentos
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=_retry)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+
+# Cache de respuestas no-streaming para payloads idénticos
+CACHE_MAX_ENTRIES = int(os.getenv("RALF_CACHE_MAX_ENTRIES", "1024"))
+CACHE_TTL = float(os.getenv("RALF_CACHE_TTL", "600"))  # segundos
+
+
+class ResponseCache(LRUCache):
     """
-    Llama a la API RALF con lógica de reintentos exponencial.
-    Retorna (response, error). Si hay error, response es None.
+    Cache LRU con TTL, direccionada por contenido (hash de los mensajes).
     """
-    last_error = None
 
-    for attempt in range(MAX_RETRIES):
-        try:
-            if attempt > 0:
-                logger.info(f"🔄 Reintento {attempt + 1}/{MAX_RETRIES} para RALF...")
+    @staticmethod
+    def key_for(messages: Any) -> str:
+        raw = orjson.dumps(messages, option=orjson.OPT_SORT_KEYS)
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
 
-            response = requests.post(
-                RALF_ENDPOINT, json=ralf_payload, stream=stream, timeout=timeout
-            )
 
-            # Si es exitoso (200-299), retornar respuesta
-            if 200 <= response.status_code < 300:
-                return response, None
+_response_cache = ResponseCache(CACHE_MAX_ENTRIES, CACHE_TTL)
 
-            # Si es error de cliente (4xx) que no sea 429, no reintentar
-            if 400 <= response.status_code < 500 and response.status_code != 429:
-                error_msg = (
-                    f"Error cliente RALF: {response.status_code} - {response.text}"
-                )
-                logger.error(error_msg)
-                return None, {"error": error_msg, "status_code": response.status_code}
+# Campos fijos de la respuesta OpenAI no-streaming (solo lectura)
+_OPENAI_TEMPLATE: Dict[str, Any] = {
+    "id": "chatcmpl-proxy",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "ralf-mixed-model",
+    "choices": [],
+    "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+}
 
-            # Si es 429 o 5xx, reintentar
-            error_msg = (
-                f"Error temporal RALF: {response.status_code} - {response.text[:200]}"
-            )
-            logger.warning(error_msg)
-            last_error = {"error": error_msg, "status_code": response.status_code}
-
-        except requests.RequestException as e:
-            error_msg = f"Excepción conexión RALF: {str(e)}"
-            logger.warning(error_msg)
-            last_error = {"error": error_msg, "status_code": 503}
-
-        # Calcular espera con backoff exponencial y jitter
-        # delay = base * (2 ^ attempt) + jitter
-        delay = min(MAX_DELAY, BASE_DELAY * (2**attempt))
-        jitter = delay * JITTER_RANGE * (random.random() * 2 - 1)  # +/- range
-        final_delay = max(0.5, delay + jitter)
-
-        if attempt < MAX_RETRIES - 1:
-            logger.info(
-                f"⏳ Esperando {final_delay:.2f}s antes del siguiente reintento..."
-            )
-            time.sleep(final_delay)
 
-    return None, last_error
+def build_openai_response(content: str) -> Dict[str, Any]:
+    """
+    Copia superficial de la plantilla; solo se crean los campos que varían.
+    """
+    openai_response = _OPENAI_TEMPLATE.copy()
+    openai_response["created"] = int(time.time())
+    openai_response["choices"] = [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }
+    ]
+    return openai_response
+
+
+def call_ralf_with_retry(
+    ralf_payload: Dict[str, Any], stream: bool = False, timeout: int = 60
+) -> Tuple[Optional[requests.Response], Optional[Dict[str, Any]]]:
+    """
+    Llama a la API RALF; los reintentos con backoff los aplica el adaptador.
+    Retorna (response, error). Si hay error, response es None.
+    """
+    try:
+        response = _session.post(
+            RALF_ENDPOINT, json=ralf_payload, stream=stream, timeout=timeout
+        )
+    except requests.RequestException as e:
+        error_msg = f"Excepción conexión RALF: {str(e)}"
+        logger.warning(error_msg)
+        return None, {"error": error_msg, "status_code": 503}
+
+    # Si es exitoso (200-299), retornar respuesta
+    if 200 <= response.status_code < 300:
+        return response, None
+
+    # Error de cliente (4xx) o error temporal que agotó los reintentos
+    error_msg = f"Error RALF: {response.status_code} - {response.text[:200]}"
+    logger.error(error_msg)
+    return None, {"error": error_msg, "status_code": response.status_code}
 
 
 @app.route("/v1/chat/completions", methods=["POST"])
@@ -102,7 +158,9 @@ def chat_completions():
         if not openai_data:
             return {"error": "No JSON data provided"}, 400
 
-        print(f"📥 Petición recibida: {json.dumps(openai_data, indent=2)}")
+        # Serializar el payload solo si el nivel DEBUG está activo
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("📥 Petición recibida: %s", json.dumps(openai_data))
 
         # Extraer mensajes
         messages = openai_data.get("messages", [])
@@ -110,13 +168,20 @@ def chat_completions():
         if not messages:
             return {"error": "No messages provided"}, 400
 
+        # Responder desde cache si ya se resolvió exactamente este payload
+        is_streaming = openai_data.get("stream", False)
+        cache_key = None
+        if not is_streaming:
+            cache_key = ResponseCache.key_for(messages)
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("⚡ Respuesta servida desde cache")
+                return cached
+
         # Convertir al formato de API_RALF
         ralf_payload = {"messages": messages}
 
-        print(f"📤 Enviando a RALF: {json.dumps(ralf_payload, indent=2)}")
-
         # Llamar a API_RALF con manejo de rate limits
-        is_streaming = openai_data.get("stream", False)
         response, error = call_ralf_with_retry(
             ralf_payload=ralf_payload, stream=is_streaming, timeout=60
         )
@@ -133,66 +198,52 @@ def chat_completions():
                     "Espera unos minutos antes de reintentar."
                 )
 
-            print(f"❌ Error final de RALF: {error_message}")
+            logger.error("❌ Error final de RALF: %s", error_message)
             return {"error": error_message}, status_code
 
         if response is None:
             return {"error": "No response received from RALF service"}, 500
 
-        print(f"📡 Respuesta RALF exitosa: status 200")
+        logger.info("📡 Respuesta RALF exitosa: status %s", response.status_code)
 
         # Si es streaming, reenviar como OpenAI streaming
         if is_streaming:
 
             def generate():
-                for line in response.iter_lines():
-                    if line:
-                        # Formato OpenAI streaming
-                        chunk = {
-                            "choices": [
-                                {
-                                    "delta": {"content": line.decode("utf-8")},
-                                    "index": 0,
-                                    "finish_reason": None,
-                                }
-                            ]
-                        }
-                        yield f"data: {json.dumps(chunk)}\n\n"
+                # Reenviar el cuerpo por bloques en lugar de re-parsear línea
+                # a línea; el decoder incremental evita cortar caracteres UTF-8
+                # multibyte entre bloques. Los saltos de línea de RALF se
+                # conservan en los deltas (antes iter_lines() los descartaba),
+                # igual que en la respuesta no-streaming
+                decoder = codecs.getincrementaldecoder("utf-8")()
+                for block in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    text = decoder.decode(block)
+                    if text:
+                        # Formato OpenAI streaming: solo se serializa el texto
+                        yield _SSE_CHUNK_PREFIX + orjson.dumps(text) + _SSE_CHUNK_SUFFIX
 
                 # Final del stream
-                yield "data: [DONE]\n\n"
+                yield b"data: [DONE]\n\n"
 
             return Response(
                 stream_with_context(generate()), mimetype="text/event-stream"
             )
 
-        # Si no es streaming, devolver respuesta completa
-        full_response = ""
-        for line in response.iter_lines():
-            if line:
-                full_response += line.decode("utf-8")
+        # Si no es streaming, devolver respuesta completa (un solo decode del
+        # buffer de la respuesta en lugar de concatenar línea a línea)
+        full_response = response.content.decode("utf-8")
 
         # Formato OpenAI no-streaming
-        openai_response = {
-            "id": "chatcmpl-proxy",
-            "object": "chat.completion",
-            "created": 1234567890,
-            "model": "ralf-mixed-model",
-            "choices": [
-                {
-                    "index": 0,
-                    "message": {"role": "assistant", "content": full_response},
-                    "finish_reason": "stop",
-                }
-            ],
-            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
-        }
+        openai_response = build_openai_response(full_response)
+
+        if cache_key is not None:
+            _response_cache.put(cache_key, openai_response)
 
         return openai_response
 
     except Exception as e:
         error_msg = f"Error interno del proxy: {str(e)}"
-        logger.error(f"❌ {error_msg}")
+        logger.error("❌ %s", error_msg)
         import traceback
 
         traceback.print_exc()
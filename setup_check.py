@@ -12,6 +12,7 @@ Uso:
 
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dotenv import load_dotenv
 
 # Colores para terminal
@@ -53,7 +54,18 @@ def check_python_version():
 
 def check_dependencies() -> tuple[bool, list[str]]:
     """Verifica que las dependencias estén instaladas"""
-    required = ["flask", "flask_socketio", "crewai", "langchain", "dotenv", "requests"]
+    required = [
+        "flask",
+        "flask_socketio",
+        "eventlet",
+        "crewai",
+        "langchain",
+        "dotenv",
+        "requests",
+        "httpx",
+        "orjson",
+        "msgspec",
+    ]
 
     missing: list[str] = []
     for package in required:
@@ -125,12 +137,8 @@ def check_directory_structure():
     return all_ok
 
 
-def test_api_connectivity():
-    """Intenta conectar con las APIs"""
-    import requests
-
-    # Test ScraperRalf
-    scraper_url = os.getenv("SCRAPER_BASE_URL", "http://localhost:5000")
+def _probe_scraper(requests, scraper_url):
+    """Prueba ScraperRalf con una búsqueda mínima."""
     try:
         response = requests.get(
             f"{scraper_url}/api/search?q=test&max_results=1", timeout=5
@@ -144,22 +152,38 @@ def test_api_connectivity():
     except Exception as e:
         print_error(f"ScraperRalf NO accesible: {str(e)[:50]}")
 
-    # Test API_RALF (más complejo, solo ping básico)
+
+def _probe_ralf(requests, url):
+    """Ping básico (HEAD) a la base de API_RALF."""
+    try:
+        requests.head(url, timeout=5, verify=False)
+        print_success(f"API_RALF responde en {url}")
+    except Exception as e:
+        print_warning(f"API_RALF no responde (esto puede ser normal): {str(e)[:50]}")
+
+
+def test_api_connectivity():
+    """Intenta conectar con las APIs (en paralelo: total = sonda más lenta)"""
+    import requests
+
+    scraper_url = os.getenv("SCRAPER_BASE_URL", "http://localhost:5000")
     ralf_domain = os.getenv("DOMINIO_API_RALF", "")
-    if ralf_domain:
-        try:
-            # Intentar HEAD request a la base
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        # Test ScraperRalf
+        futures = [executor.submit(_probe_scraper, requests, scraper_url)]
+
+        # Test API_RALF (más complejo, solo ping básico)
+        if ralf_domain:
             url = (
                 f"https://{ralf_domain}"
                 if not ralf_domain.startswith("http")
                 else ralf_domain
             )
-            response = requests.head(url, timeout=5, verify=False)
-            print_success(f"API_RALF responde en {url}")
-        except Exception as e:
-            print_warning(
-                f"API_RALF no responde (esto puede ser normal): {str(e)[:50]}"
-            )
+            futures.append(executor.submit(_probe_ralf, requests, url))
+
+        for future in as_completed(futures):
+            future.result()
 
 
 def main():
@@ -0,0 +1,137 @@
+"""
+=============================================================================
+MÓDULO: Cache de Artículos por Tema
+=============================================================================
+
+Evita re-ejecutar el pipeline completo de agentes (varias llamadas al LLM y
+a ScraperRalf, decenas de segundos) cuando se pide de nuevo el mismo tema
+para la misma fecha de referencia.
+
+ARQUITECTURA:
+- Clave sha256(tema normalizado | fecha)
+- diskcache.Cache si está instalado y TOPIC_CACHE_DIR está definido
+  (persistente y compartido entre workers del mismo host)
+- LRUCache en memoria en caso contrario (la misma LRU con TTL que usa la
+  cache de respuestas de ralf_proxy.py)
+
+Solo se cachean artículos aprobados por el Analista (status == "success").
+Desactivada por defecto (TOPIC_CACHE_ENABLED=False).
+"""
+
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+TOPIC_CACHE_ENABLED = os.getenv("TOPIC_CACHE_ENABLED", "False").lower() == "true"
+TOPIC_CACHE_DIR = os.getenv("TOPIC_CACHE_DIR", "")
+TOPIC_CACHE_MAX_ENTRIES = int(os.getenv("TOPIC_CACHE_MAX_ENTRIES", "512"))
+TOPIC_CACHE_TTL = float(os.getenv("TOPIC_CACHE_TTL", "86400"))  # segundos
+
+try:
+    import diskcache
+except ImportError:  # pragma: no cover - dependencia opcional
+    diskcache = None
+
+
+def normalize_topic(topic: str) -> str:
+    """Minúsculas y espacios colapsados: 'IA  en Chile' == 'ia en chile'."""
+    return " ".join(topic.casefold().split())
+
+
+def topic_key(topic: str, current_date: str) -> str:
+    raw = f"{normalize_topic(topic)}|{current_date}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+class LRUCache:
+    """
+    Cache LRU con TTL en memoria del proceso, protegida por un lock.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, value = entry
+            if time.monotonic() - stored_at > self._ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+
+class _DiskBackend:
+    """
+    diskcache.Cache con expiración por entrada; diskcache acota el tamaño en
+    disco (size_limit) desalojando las entradas menos usadas.
+    """
+
+    def __init__(self, directory: str, ttl: float):
+        self._cache = diskcache.Cache(directory, eviction_policy="least-recently-used")
+        self._ttl = ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self._cache.get(key)
+
+    def put(self, key: str, value: Dict[str, Any]):
+        self._cache.set(key, value, expire=self._ttl)
+
+
+class TopicCache:
+    """
+    Cache de artículos generados por (tema, fecha).
+    """
+
+    def __init__(self):
+        if TOPIC_CACHE_DIR and diskcache is not None:
+            self._backend = _DiskBackend(TOPIC_CACHE_DIR, TOPIC_CACHE_TTL)
+            logger.info("🗃️ Cache de temas en disco (%s)", TOPIC_CACHE_DIR)
+        else:
+            self._backend = LRUCache(TOPIC_CACHE_MAX_ENTRIES, TOPIC_CACHE_TTL)
+            logger.info("🗃️ Cache de temas en memoria")
+
+    def get(self, topic: str, current_date: str) -> Optional[Dict[str, Any]]:
+        """
+        Retorna {"article", "iterations"} si el tema ya se generó para esa
+        fecha, o None.
+        """
+        return self._backend.get(topic_key(topic, current_date))
+
+    def set(self, topic: str, current_date: str, value: Dict[str, Any]):
+        self._backend.put(topic_key(topic, current_date), value)
+
+
+# Singleton para reutilización
+_topic_cache_instance: Optional[TopicCache] = None
+
+
+def get_topic_cache() -> Optional[TopicCache]:
+    """
+    Retorna la cache de temas, o None si TOPIC_CACHE_ENABLED=False.
+    """
+    global _topic_cache_instance
+    if not TOPIC_CACHE_ENABLED:
+        return None
+    if _topic_cache_instance is None:
+        _topic_cache_instance = TopicCache()
+    return _topic_cache_instance
@@ -13,32 +13,102 @@ FUNDAMENTACIÓN TEÓRICA:
 
 ARQUITECTURA:
 - Intercepta eventos de CrewAI mediante callbacks
-- Emite eventos Socket.IO al frontend
+- Agrupa los eventos en lotes y los emite por Socket.IO al frontend
 - Mantiene estado del flujo de ejecución
 """
 
 import logging
-from typing import Any, Dict, Optional
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from itertools import islice
+from threading import Lock
+from typing import Any, Deque, Dict, Optional, Union
 from datetime import datetime
-import json
+import time
+
+import orjson
 
 # Importaciones de Socket.IO (se inyectará la instancia)
 socketio_instance = None
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
+# Si True, los eventos agent_thinking (alto volumen) solo se generan cuando
+# la room de la sesión tiene sockets conectados; el resto se encola siempre
+# para que crew_start y los primeros eventos lleguen aunque el cliente aún no
+# se haya unido (solo fiable en modo de proceso único: con cola de
+# mensajes Redis las rooms viven en otros procesos)
+_track_subscribers = False
+
+# El logging lo configura el punto de entrada (app.py)
 logger = logging.getLogger(__name__)
 
+# Agrupación de eventos: ventana de envío y tamaño máximo de un lote
+BATCH_INTERVAL = 0.1  # segundos
+BATCH_MAX_EVENTS = 50
+# Capacidad del buffer: si el frontend no drena, se descartan los más antiguos
+MAX_PENDING_EVENTS = 1024
+
+# Longitud máxima de los textos enviados al frontend (para no saturar)
+_TRUNC_TASK = 200
+_TRUNC_THOUGHT = 300
+_TRUNC_OUTPUT = 400
+_TRUNC_RESULT = 500
+_TRUNC_PREVIEW = 150
+_TRUNC_ERROR = 100
+_TRUNC_INPUT_VALUE = 100
+_INPUT_PREVIEW_KEYS = 5
+# Alertas de distribución de fuentes indexadas por (sin Tier 1, con Tier 2):
+# (mensaje para el frontend, detalle para el log)
+_ALERTS = {
+    (True, True): (
+        "⚠️ ADVERTENCIA: Solo APIs globales recibidas. Scrapers locales no respondieron.",
+        "   Posibles causas:\n"
+        "   1. ScraperRalf tiene timeout interno < 90s\n"
+        "   2. Scrapers locales están fallando\n"
+        "   3. Camoufox no instalado: 'camoufox fetch'",
+    ),
+}
+
+# Máximo ~10 eventos agent_thinking por segundo y sesión
+THINKING_MIN_INTERVAL = 0.1  # segundos
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Recorta `text` a `limit` caracteres sin copiar si ya es más corto."""
+    return text if len(text) <= limit else text[:limit]
+
+
+def _preview_input(tool_input: Any) -> Any:
+    """
+    Vista previa estructurada de la entrada de una herramienta.
+
+    Para dicts conserva solo las primeras claves y recorta los valores de
+    texto, sin convertir la entrada completa a string.
+    """
+    if not isinstance(tool_input, dict):
+        return _truncate(repr(tool_input), _TRUNC_TASK)
+
+    preview = {}
+    for key, value in islice(tool_input.items(), _INPUT_PREVIEW_KEYS):
+        if isinstance(value, str):
+            value = _truncate(value, _TRUNC_INPUT_VALUE)
+        elif not isinstance(value, (int, float, bool, type(None))):
+            value = _truncate(repr(value), _TRUNC_INPUT_VALUE)
+        preview[key] = value
+    return preview
+
 
-def set_socketio(socketio):
+def set_socketio(socketio, track_subscribers: bool = False):
     """
     Inyecta la instancia de SocketIO para uso en callbacks.
 
     Args:
         socketio: Instancia de flask_socketio.SocketIO
+        track_subscribers: Descartar agent_thinking de sesiones sin clientes
+            suscritos (requiere que la crew corra en el mismo proceso)
     """
-    global socketio_instance
+    global socketio_instance, _track_subscribers
     socketio_instance = socketio
+    _track_subscribers = track_subscribers
     logger.info("✅ Socket.IO inyectado en el sistema de callbacks")
 
 
@@ -51,6 +121,14 @@ class RealtimeAgentCallback:
     - Cada acción del agente genera un evento observable
     - Permite construcción de grafo de ejecución en UI
 
+    Los eventos no se emiten uno a uno: se acumulan y se envían en un único
+    frame "batch" (lista ordenada de {"event", "data"}) cada BATCH_INTERVAL
+    segundos o al llegar a BATCH_MAX_EVENTS.
+
+    El buffer es doble (ping-pong): los callbacks escriben en el buffer activo
+    mientras el otro se drena en background; ambos están acotados a
+    MAX_PENDING_EVENTS y los eventos descartados se notifican con "overflow".
+
     EVENTOS EMITIDOS:
     - crew_start: Inicio de la crew
     - agent_start: Un agente comienza su tarea
@@ -62,45 +140,155 @@ class RealtimeAgentCallback:
     - error: Cualquier error durante la ejecución
     """
 
-    def __init__(self, session_id: str = "default"):
+    def __init__(self, session_id: str = "default", socketio=None):
         """
         Inicializa el callback handler.
 
         Args:
             session_id: Identificador único de la sesión para múltiples usuarios
+            socketio: Instancia de SocketIO; por defecto la inyectada con
+                set_socketio() (se resuelve una sola vez, al construir)
         """
         self.session_id = session_id
+        self._sio = socketio or socketio_instance
         self.start_time = datetime.now()
+        self._start_mono = time.monotonic()
         self.current_agent = None
         self.task_counter = 0
-        logger.info(f"🎬 Callback handler iniciado (session: {session_id})")
+        self._active: Deque[Dict[str, Any]] = deque(maxlen=MAX_PENDING_EVENTS)
+        self._standby: Deque[Dict[str, Any]] = deque(maxlen=MAX_PENDING_EVENTS)
+        self._dropped = 0
+        self._lock = Lock()
+        self._drain_lock = Lock()
+        self._flush_scheduled = False
+        self._batch_depth = 0
+        self._last_thinking = 0.0
+        logger.info("🎬 Callback handler iniciado (session: %s)", session_id)
 
     def _emit(self, event_name: str, data: Dict[str, Any]):
         """
-        Emite un evento Socket.IO al frontend.
+        Encola un evento para el frontend; se envía en el próximo lote.
 
         Args:
             event_name: Nombre del evento
             data: Payload del evento
         """
-        if socketio_instance is None:
+        if self._sio is None:
             logger.warning("⚠️ Socket.IO no configurado, evento no emitido")
             return
 
-        # Agregar metadata común
-        payload = {
-            **data,
-            "session_id": self.session_id,
-            "timestamp": datetime.now().isoformat(),
-            "elapsed_time": (datetime.now() - self.start_time).total_seconds(),
-        }
+        # Agregar metadata común in situ (cada callback construye su propio
+        # dict): reloj monotónico para el tiempo transcurrido y timestamp en
+        # ns, que se convierte a datetime solo al enviar el lote
+        data["session_id"] = self.session_id
+        data["timestamp"] = time.time_ns()
+        data["elapsed_time"] = time.monotonic() - self._start_mono
+
+        with self._lock:
+            if len(self._active) == MAX_PENDING_EVENTS:
+                self._dropped += 1  # deque(maxlen) descarta el más antiguo
+            self._active.append({"event": event_name, "data": data})
+            full = len(self._active) >= BATCH_MAX_EVENTS
+            schedule = not (self._flush_scheduled or self._batch_depth) or full
+            if schedule:
+                self._flush_scheduled = True
+
+        logger.debug("📡 Encolado: %s -> %s", event_name, data.get("agent", "N/A"))
+
+        # El envío siempre ocurre fuera del hilo del agente
+        if schedule:
+            self._sio.start_background_task(
+                self.flush if full else self._flush_later
+            )
+
+    def has_subscribers(self) -> bool:
+        """
+        True si algún socket está unido a la room de la sesión.
+
+        Sin seguimiento de suscriptores (modo multi-proceso) asume que sí.
+        """
+        if not _track_subscribers or self._sio is None:
+            return True
+        rooms = self._sio.server.manager.rooms.get("/agents", {})
+        return bool(rooms.get(self.session_id))
+
+    def _flush_later(self):
+        """Espera la ventana de agrupación y envía el lote acumulado."""
+        self._sio.sleep(BATCH_INTERVAL)
+        self.flush()
+
+    def _flush_soon(self):
+        """
+        Envía los eventos pendientes sin esperar la ventana de agrupación,
+        pero en background: el hilo del agente nunca bloquea en el socket.
+        """
+        if self._sio is not None:
+            self._sio.start_background_task(self.flush)
+
+    def flush(self):
+        """
+        Envía inmediatamente todos los eventos pendientes en un único frame.
+
+        Es síncrono: lo usa app.py para vaciar el buffer antes de emitir
+        generation_complete; los callbacks usan _flush_soon().
+        """
+        # Un único drenado a la vez (preserva el orden entre lotes); el buffer
+        # en espera queda vacío y listo para el siguiente intercambio
+        with self._drain_lock:
+            with self._lock:
+                events = self._active
+                self._active, self._standby = self._standby, events
+                dropped, self._dropped = self._dropped, 0
+                self._flush_scheduled = False
+
+            if not events or self._sio is None:
+                events.clear()
+                return
+
+            batch = list(events)
+            events.clear()
+
+            # datetime nativo: orjson lo serializa a ISO 8601 al codificar
+            for item in batch:
+                data = item["data"]
+                data["timestamp"] = datetime.fromtimestamp(data["timestamp"] / 1e9)
+
+            if dropped:
+                batch.append(
+                    {
+                        "event": "overflow",
+                        "data": {"session_id": self.session_id, "dropped": dropped},
+                    }
+                )
+                logger.warning("⚠️ %d eventos descartados (frontend lento)", dropped)
+
+            try:
+                self._sio.emit(
+                    "batch", batch, namespace="/agents", to=self.session_id
+                )
+            except Exception as e:
+                logger.error("❌ Error emitiendo lote de %d eventos: %s", len(batch), e)
+
+    @contextmanager
+    def batch(self):
+        """
+        Agrupa todos los eventos del bloque en un solo envío al salir.
 
-        # Emitir evento
+        Uso:
+            with callback.batch():
+                callback.on_agent_start(...)
+                callback.on_tool_start(...)
+        """
+        with self._lock:
+            self._batch_depth += 1
         try:
-            socketio_instance.emit(event_name, payload, namespace="/agents")
-            logger.debug(f"📡 Emitido: {event_name} -> {data.get('agent', 'N/A')}")
-        except Exception as e:
-            logger.error(f"❌ Error emitiendo evento {event_name}: {e}")
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                done = self._batch_depth == 0
+            if done:
+                self._flush_soon()
 
     # =========================================================================
     # CALLBACKS DE CREW
@@ -130,11 +318,12 @@ class RealtimeAgentCallback:
         self._emit(
             "crew_finish",
             {
-                "result": str(result)[:500],  # Truncar para no saturar
-                "total_time": (datetime.now() - self.start_time).total_seconds(),
+                "result": _truncate(str(result), _TRUNC_RESULT),
+                "total_time": time.monotonic() - self._start_mono,
                 "message": "🎉 Proceso completado exitosamente",
             },
         )
+        self._flush_soon()
 
     # =========================================================================
     # CALLBACKS DE AGENTES
@@ -155,7 +344,7 @@ class RealtimeAgentCallback:
             "agent_start",
             {
                 "agent": agent_name,
-                "task": task_description[:200],
+                "task": _truncate(task_description, _TRUNC_TASK),
                 "task_number": self.task_counter,
                 "message": f"🤖 {agent_name} iniciando trabajo",
             },
@@ -168,12 +357,22 @@ class RealtimeAgentCallback:
         Teoría (AIMA Cap. 2.4):
         - Visualización del proceso deliberativo interno
         - Crucial para entender la "cadena de razonamiento"
+
+        Puede dispararse por token: se limita a un evento cada
+        THINKING_MIN_INTERVAL y se omite si nadie observa la sesión.
         """
+        now = time.monotonic()
+        if now - self._last_thinking < THINKING_MIN_INTERVAL:
+            return
+        if not self.has_subscribers():
+            return
+        self._last_thinking = now
+
         self._emit(
             "agent_thinking",
             {
                 "agent": agent_name,
-                "thought": thought[:300],
+                "thought": _truncate(thought, _TRUNC_THOUGHT),
                 "message": f"💭 {agent_name} está razonando...",
             },
         )
@@ -186,7 +385,7 @@ class RealtimeAgentCallback:
             "agent_finish",
             {
                 "agent": agent_name,
-                "output": output[:400],
+                "output": _truncate(output, _TRUNC_OUTPUT),
                 "message": f"✅ {agent_name} completó su tarea",
             },
         )
@@ -206,7 +405,7 @@ class RealtimeAgentCallback:
             {
                 "agent": "Analista de Sesgos y Fact-Checker",
                 "target": "Investigador de Noticias",
-                "feedback": feedback[:300],
+                "feedback": _truncate(feedback, _TRUNC_THOUGHT),
                 "message": "🔄 RECHAZADO: Volviendo a investigar...",
             },
         )
@@ -215,60 +414,77 @@ class RealtimeAgentCallback:
     # CALLBACKS DE HERRAMIENTAS
     # =========================================================================
 
-    def on_tool_start(self, tool_name: str, tool_input: Dict[str, Any]):
+    def on_tool_start(self, tool: Any, tool_input: Dict[str, Any]):
         """
         Se llama cuando un agente comienza a usar una herramienta.
 
         Teoría (AIMA Cap. 2.3):
         - Activación de sensores/efectores del agente
         - Interacción con el entorno externo
+
+        Args:
+            tool: Nombre de la herramienta u objeto herramienta de CrewAI
+            tool_input: Argumentos de la llamada
         """
+        tool_name = getattr(tool, "name", tool)
         self._emit(
             "tool_start",
             {
                 "agent": self.current_agent or "Unknown",
                 "tool": tool_name,
-                "input": str(tool_input)[:200],
+                "input": _preview_input(tool_input),
                 "message": f"🔧 Usando herramienta: {tool_name}",
             },
         )
 
-    def on_tool_end(self, tool_name: str, tool_output: str):
+    def on_tool_end(self, tool: Any, tool_output: Union[str, Dict[str, Any]]):
         """
         Se llama cuando una herramienta retorna resultado.
 
+        `tool` puede ser el nombre o el objeto herramienta de CrewAI.
+
+        Acepta la salida ya parseada (dict) para evitar serializar y volver a
+        parsear el mismo JSON; si llega como texto se parsea con orjson.
+
         LOGGING MEJORADO:
         - Muestra distribución de fuentes para NewsSearchTool
         - Alerta si solo se reciben APIs globales (problema de timeout)
         """
+        tool_name = getattr(tool, "name", tool)
+
         # Intentar parsear si es JSON
         output_preview = ""
         alert_message = None
 
         try:
-            parsed_output = json.loads(tool_output)
-            output_preview = f"Status: {parsed_output.get('status', 'N/A')}"
+            if isinstance(tool_output, dict):
+                parsed_output = tool_output
+            else:
+                parsed_output = orjson.loads(tool_output)
+                if not isinstance(parsed_output, dict):
+                    raise TypeError("salida JSON sin objeto raíz")
+            status = parsed_output.get("status", "N/A")
 
             if "total_results" in parsed_output:
                 total = parsed_output["total_results"]
                 deep = parsed_output.get("deep_sources_count", 0)
                 api = parsed_output.get("api_sources_count", 0)
 
-                output_preview += f" | Total: {total}"
-                output_preview += f" | 🟢Tier1: {deep}"
-                output_preview += f" | 🟡Tier2: {api}"
+                output_preview = (
+                    f"Status: {status} | Total: {total}"
+                    f" | 🟢Tier1: {deep} | 🟡Tier2: {api}"
+                )
 
                 # ALERTA si solo hay APIs (problema de timeout interno de ScraperRalf)
-                if deep == 0 and api > 0:
-                    alert_message = "⚠️ ADVERTENCIA: Solo APIs globales recibidas. Scrapers locales no respondieron."
-                    logger.warning(alert_message)
-                    logger.warning("   Posibles causas:")
-                    logger.warning("   1. ScraperRalf tiene timeout interno < 90s")
-                    logger.warning("   2. Scrapers locales están fallando")
-                    logger.warning("   3. Camoufox no instalado: 'camoufox fetch'")
+                alert = _ALERTS.get((deep == 0, api > 0))
+                if alert is not None:
+                    alert_message, detail = alert
+                    logger.warning("%s\n%s", alert_message, detail)
+            else:
+                output_preview = f"Status: {status}"
 
-        except:
-            output_preview = tool_output[:150]
+        except (orjson.JSONDecodeError, TypeError):
+            output_preview = _truncate(str(tool_output), _TRUNC_PREVIEW)
 
         self._emit(
             "tool_end",
@@ -281,6 +497,20 @@ class RealtimeAgentCallback:
             },
         )
 
+    # =========================================================================
+    # HOOKS DE CREWAI (interfaz de callbacks de tareas)
+    # =========================================================================
+
+    def on_task_start(self, task):
+        """Hook de CrewAI cuando inicia una tarea."""
+        agent_name = getattr(getattr(task, "agent", None), "role", "Unknown")
+        self.on_agent_start(agent_name, task.description)
+
+    def on_task_end(self, task, output):
+        """Hook de CrewAI cuando termina una tarea."""
+        agent_name = getattr(getattr(task, "agent", None), "role", "Unknown")
+        self.on_agent_finish(agent_name, str(output))
+
     # =========================================================================
     # CALLBACKS DE ERRORES Y LOGS
     # =========================================================================
@@ -298,9 +528,10 @@ class RealtimeAgentCallback:
             {
                 "agent": agent_name or self.current_agent or "System",
                 "error": error_message,
-                "message": f"❌ Error: {error_message[:100]}",
+                "message": f"❌ Error: {_truncate(error_message, _TRUNC_ERROR)}",
             },
         )
+        self._flush_soon()
 
     def on_log(self, log_message: str, level: str = "info"):
         """
@@ -316,43 +547,19 @@ class RealtimeAgentCallback:
         )
 
 
-class CrewCallbackHandler:
-    """
-    Wrapper para integrar RealtimeAgentCallback con CrewAI.
-
-    CrewAI usa un sistema de callbacks específico. Esta clase
-    adapta nuestro callback a la interfaz esperada.
-    """
-
-    def __init__(self, session_id: str = "default"):
-        self.callback = RealtimeAgentCallback(session_id)
-
-    def on_task_start(self, task):
-        """Hook de CrewAI cuando inicia una tarea."""
-        agent_name = task.agent.role if hasattr(task, "agent") else "Unknown"
-        self.callback.on_agent_start(agent_name, task.description)
-
-    def on_task_end(self, task, output):
-        """Hook de CrewAI cuando termina una tarea."""
-        agent_name = task.agent.role if hasattr(task, "agent") else "Unknown"
-        self.callback.on_agent_finish(agent_name, str(output))
-
-    def on_tool_start(self, tool, input_data):
-        """Hook de CrewAI cuando usa una herramienta."""
-        self.callback.on_tool_start(tool.name, input_data)
-
-    def on_tool_end(self, tool, output):
-        """Hook de CrewAI cuando termina de usar una herramienta."""
-        self.callback.on_tool_end(tool.name, output)
-
-
-# Singleton global para uso en crew.py
-_global_callback = None
+# Registro de callbacks por sesión (LRU acotado) para uso en crew.py y app.py
+MAX_CALLBACK_SESSIONS = 128
+_callbacks: "OrderedDict[str, RealtimeAgentCallback]" = OrderedDict()
+_callbacks_lock = Lock()
 
 
 def get_callback_handler(session_id: str = "default") -> RealtimeAgentCallback:
     """
-    Factory para obtener instancia de callback.
+    Factory para obtener la instancia de callback de una sesión.
+
+    Cada sesión conserva su propio handler (start_time, task_counter, buffer)
+    aunque haya generaciones concurrentes; se descartan las menos recientes
+    por encima de MAX_CALLBACK_SESSIONS.
 
     Args:
         session_id: ID de sesión para tracking
@@ -360,16 +567,23 @@ def get_callback_handler(session_id: str = "default") -> RealtimeAgentCallback:
     Returns:
         Instancia de RealtimeAgentCallback
     """
-    global _global_callback
-    if _global_callback is None or _global_callback.session_id != session_id:
-        _global_callback = RealtimeAgentCallback(session_id)
-    return _global_callback
+    with _callbacks_lock:
+        callback = _callbacks.get(session_id)
+        if callback is None:
+            callback = RealtimeAgentCallback(session_id)
+            _callbacks[session_id] = callback
+            if len(_callbacks) > MAX_CALLBACK_SESSIONS:
+                _callbacks.popitem(last=False)
+        else:
+            _callbacks.move_to_end(session_id)
+        return callback
 
 
 if __name__ == "__main__":
     """
     Test de callbacks sin Socket.IO (modo simulado).
     """
+    logging.basicConfig(level=logging.INFO)
     print("🧪 Probando sistema de callbacks...\n")
 
     callback = RealtimeAgentCallback("test-session")
@@ -1,73 +1,144 @@
 import re
+from typing import List
 
+# Escáner único: cada alternativa nombrada corresponde a una regla del
+# formateo y se resuelve en la misma pasada sobre el texto crudo
+_PAT_ARTICLE = re.compile(
+    r"(?P<ws>\s{2,}|[^\S ])"  # Espacios a normalizar (un espacio suelto no)
+    r"|(?P<block>#+(?=\s)|>(?=\s)|-(?=\s+\*\*)|-(?=\s+[A-Z])|---)"  # Bloques
+    r"|(?P<bold>\*\*)"  # Marcadores de negrita
+    r"|(?<=[a-záéíóúñ])(?P<camel>)(?=[A-ZÁÉÍÓÚÑ])"  # CamelCase accidental
+)
+_PAT_MULTINL = re.compile(r"\n{3,}")
+_PAT_WS_RUN = re.compile(r"\s*")
 
-def fix_bold_spacing(text):
+
+def fix_bold_spacing(text: str) -> str:
     """
     Corrige el espaciado alrededor de marcadores de negrita (**).
     Usa isalnum() para decidir si separar, evitando separar puntuación.
     """
-    parts = text.split("**")
-    if len(parts) < 2:
+    pos = text.find("**")
+    if pos < 0:
         return text
 
-    result = []
-    for i in range(len(parts)):
-        part = parts[i]
-        result.append(part)
+    parts: List[str] = []
+    start = 0
+    end_of_text = len(text)
+    opening = True  # Los marcadores alternan apertura/cierre
 
-        if i < len(parts) - 1:
-            prev_char = part[-1] if part else ""
-            next_char = parts[i + 1][0] if parts[i + 1] else ""
+    while pos >= 0:
+        parts.append(text[start:pos])
+        end = pos + 2
 
-            sep = "**"
+        sep = "**"
 
-            if i % 2 == 0:  # Abriendo negrita (Plain -> Bold)
-                # Separar si el caracter anterior es alfanumérico (pegado a palabra)
-                if prev_char.isalnum():
-                    sep = "\n\n**"
-            else:  # Cerrando negrita (Bold -> Plain)
-                # Separar si el caracter siguiente es alfanumérico (pegado a palabra)
-                # Esto mantiene la puntuación pegada a la negrita (ej: **Bold**:)
-                if next_char.isalnum():
-                    sep = "**\n\n"
+        if opening:  # Abriendo negrita (Plain -> Bold)
+            # Separar si el caracter anterior es alfanumérico (pegado a palabra)
+            if pos > start and text[pos - 1].isalnum():
+                sep = "\n\n**"
+        else:  # Cerrando negrita (Bold -> Plain)
+            # Separar si el caracter siguiente es alfanumérico (pegado a palabra)
+            # Esto mantiene la puntuación pegada a la negrita (ej: **Bold**:)
+            if end < end_of_text and text[end].isalnum():
+                sep = "**\n\n"
 
-            result.append(sep)
+        parts.append(sep)
+        opening = not opening
+        start = end
+        pos = text.find("**", start)
 
-    return "".join(result)
+    parts.append(text[start:])
+    return "".join(parts)
 
 
-def format_news_article(raw_text):
+def format_news_article(raw_text: str) -> str:
     """
     Toma un texto crudo generado por un LLM que ha perdido formato y lo reestructura
     como un artículo de periódico legible en Markdown.
+
+    Todas las reglas se aplican en un único recorrido con _PAT_ARTICLE,
+    acumulando los fragmentos en una lista que se une al final.
     """
     if not raw_text:
         return ""
 
-    # 0. Normalizar espacios
-    formatted = re.sub(r"\s+", " ", raw_text)
-
-    # 1. Asegurar saltos de línea antes de los encabezados (##, ###)
-    formatted = re.sub(r"([^\n])(#+ )", r"\1\n\n\2", formatted)
-
-    # 2. Asegurar saltos de línea antes de citas (>)
-    formatted = re.sub(r"([^\n])(> )", r"\1\n\n\2", formatted)
+    parts: List[str] = []
+    append = parts.append
+    last = 0  # Fin del último match en raw_text
+    prev_char = ""  # Último carácter emitido
+    opening = True  # Los marcadores ** alternan apertura/cierre
+    size = len(raw_text)
+    # Último marcador de bloque separado: variante y posición hasta la que
+    # lo consumía su re.sub en el formateo original
+    block_kind = ""
+    block_end = -1
+
+    for match in _PAT_ARTICLE.finditer(raw_text):
+        start = match.start()
+        if start > last:
+            append(raw_text[last:start])
+            prev_char = raw_text[start - 1]
+        end = match.end()
+        kind = match.lastgroup
+
+        if kind == "ws":
+            # 0. Normalizar espacios
+            piece = " "
+
+        elif kind == "block":
+            # 1-3, 5. Saltos de línea antes de encabezados (##), citas (>),
+            # listas (-) y la sección de fuentes (---); el separador
+            # también se aísla del texto siguiente
+            piece = match.group()
+            if piece == "---":
+                block_key, consumed = "", end
+            else:
+                # Marcador + espacios (+ "**" o la mayúscula en las listas)
+                ws_run = _PAT_WS_RUN.match(raw_text, end)
+                assert ws_run is not None  # r"\s*" siempre coincide
+                consumed = ws_run.end()
+                block_key = piece[0]
+                if block_key == "-":
+                    if raw_text.startswith("**", consumed):
+                        block_key, consumed = "-*", consumed + 2
+                    else:
+                        consumed += 1
+            # Un marcador pegado a lo que consumió el anterior de su mismo
+            # tipo ("> > cita", "# # Título", "- A- B") sigue en la misma
+            # línea, como en el formateo original
+            if block_key and block_key == block_kind and start == block_end:
+                block_kind = ""
+            elif parts:  # Hay texto antes del bloque
+                piece = "\n\n" + piece
+                block_kind, block_end = block_key, consumed
+            if piece.endswith("---") and end < size:
+                piece += "\n\n"
+
+        elif kind == "bold":
+            # 4. Corregir espaciado de negritas
+            if opening:  # Abriendo negrita (Plain -> Bold)
+                piece = "\n\n**" if prev_char.isalnum() else "**"
+            else:  # Cerrando negrita (Bold -> Plain)
+                # Mantiene la puntuación pegada a la negrita (ej: **Bold**:)
+                piece = "**\n\n" if end < size and raw_text[end].isalnum() else "**"
+            opening = not opening
 
-    # 3. Asegurar saltos de línea antes de listas (-)
-    formatted = re.sub(r"([^\n])(- \*\*)", r"\1\n\n\2", formatted)
-    formatted = re.sub(r"([^\n])(- [A-Z])", r"\1\n\n\2", formatted)
+        else:
+            # 6. Separar texto pegado (CamelCase accidental: "HechosLa")
+            piece = "\n\n"
 
-    # 4. Corregir espaciado de negritas
-    formatted = fix_bold_spacing(formatted)
+        append(piece)
+        prev_char = piece[-1]
+        last = end
 
-    # 5. Separar la sección de fuentes (---)
-    formatted = re.sub(r"([^\n])(---)", r"\1\n\n\2", formatted)
-    formatted = re.sub(r"(---)([^\n])", r"\1\n\n\2", formatted)
+    if last < size:
+        append(raw_text[last:])
 
-    # 6. Separar texto pegado (CamelCase accidental: "HechosLa", "VenezuelaLa")
-    formatted = re.sub(r"([a-záéíóúñ])([A-ZÁÉÍÓÚÑ])", r"\1\n\n\2", formatted)
+    formatted = "".join(parts)
 
     # 7. Limpieza general
-    formatted = re.sub(r"\n{3,}", "\n\n", formatted)
+    if "\n\n\n" in formatted:
+        formatted = _PAT_MULTINL.sub("\n\n", formatted)
 
     return formatted
@@ -17,7 +17,13 @@ ARQUITECTURA:
 - Endpoint: http://127.0.0.1:11434/v1 (proxy) → API_RALF real
 """
 
+import atexit
 import os
+import time
+from functools import lru_cache
+from threading import Lock
+
+import httpx
 from dotenv import load_dotenv
 from langchain_openai import ChatOpenAI
 from typing import Optional
@@ -30,6 +36,76 @@ logger = logging.getLogger(__name__)
 # Cargar variables de entorno
 load_dotenv()
 
+# Límite global opcional de peticiones al proxy (todas las crews comparten el
+# cubo); desactivado por defecto: RALF ya responde 429 y el proxy reintenta
+LLM_MAX_RPM = float(os.getenv("LLM_MAX_RPM", "0"))  # 0 = sin límite
+
+
+class TokenBucket:
+    """
+    Cubo de tokens thread-safe: `rate` tokens por segundo y ráfagas de hasta
+    `capacity` peticiones. Suaviza las ráfagas antes de que el proxy
+    responda 429 y se pierda tiempo en backoff.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = Lock()
+
+    def acquire(self):
+        """Bloquea (cediendo el hilo/greenlet) hasta disponer de un token."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._capacity, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self._rate
+            time.sleep(wait)
+
+
+class _RateLimitedTransport(httpx.HTTPTransport):
+    """Transporte httpx que consume un token antes de cada petición."""
+
+    def __init__(self, bucket: TokenBucket, **kwargs):
+        super().__init__(**kwargs)
+        self._bucket = bucket
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self._bucket.acquire()
+        return super().handle_request(request)
+
+
+# Cliente HTTP compartido por todas las instancias de ChatOpenAI: un único
+# pool keep-alive hacia el proxy en lugar de uno por instancia. Los límites
+# del pool se pasan al transporte (httpx los ignora en el Client si se le da
+# un transporte propio)
+_POOL_LIMITS = httpx.Limits(
+    max_keepalive_connections=20, max_connections=50, keepalive_expiry=300
+)
+_TRANSPORT_RETRIES = 3  # Reintentos de conexión
+_http_client = httpx.Client(
+    timeout=httpx.Timeout(120.0, connect=5.0),
+    transport=(
+        # Capacidad mínima de 1: con RPM < 1 el bucket nunca llegaría a un token
+        _RateLimitedTransport(
+            TokenBucket(rate=LLM_MAX_RPM / 60.0, capacity=max(1.0, LLM_MAX_RPM)),
+            limits=_POOL_LIMITS,
+            retries=_TRANSPORT_RETRIES,
+        )
+        if LLM_MAX_RPM > 0
+        else httpx.HTTPTransport(limits=_POOL_LIMITS, retries=_TRANSPORT_RETRIES)
+    ),
+)
+atexit.register(_http_client.close)
+
 
 class CustomLLMConfig:
     """
@@ -49,7 +125,14 @@ class CustomLLMConfig:
         self.model_name = os.getenv("RALF_MODEL_NAME", "ralf-mixed-model")
         self.temperature = 0.7
 
-        logger.info(f"🧠 LLM Configurado: {self.base_url} | Modelo: {self.model_name}")
+        # IMPORTANTE: Configurar también como variable de entorno (una sola
+        # vez, al crear la configuración, no en cada instancia de LLM)
+        os.environ["OPENAI_API_BASE"] = self.base_url
+        os.environ["OPENAI_BASE_URL"] = self.base_url
+
+        logger.info(
+            "🧠 LLM Configurado: %s | Modelo: %s", self.base_url, self.model_name
+        )
 
     def get_llm(
         self, temperature: Optional[float] = None, max_tokens: int = 2000
@@ -57,6 +140,10 @@ class CustomLLMConfig:
         """
         Retorna una instancia configurada de ChatOpenAI usando el proxy.
 
+        Las instancias se cachean por (base_url, modelo, temperature,
+        max_tokens): los agentes recreados en cada iteración reutilizan el
+        mismo cliente y su pool de conexiones HTTP hacia el proxy.
+
         Args:
             temperature: Control de aleatoriedad (0.0-1.0)
             max_tokens: Límite de tokens en respuesta
@@ -65,41 +152,44 @@ class CustomLLMConfig:
             Instancia de ChatOpenAI lista para usar en agentes
         """
         temp = temperature if temperature is not None else self.temperature
+        return _build_llm(
+            self.base_url, self.api_key, self.model_name, temp, max_tokens
+        )
 
-        try:
-            logger.info(
-                f"🔧 Creando LLM con base_url={self.base_url}, model={self.model_name}"
-            )
-
-            # IMPORTANTE: Configurar también como variable de entorno
-            os.environ["OPENAI_API_BASE"] = self.base_url
-            os.environ["OPENAI_BASE_URL"] = self.base_url
-
-            llm = ChatOpenAI(
-                openai_api_base=self.base_url,  # Parámetro legacy
-                base_url=self.base_url,  # Parámetro moderno
-                api_key=self.api_key,  # type: ignore
-                model=self.model_name,
-                temperature=temp,
-                max_tokens=max_tokens,
-                timeout=120,  # Aumentado de 60 a 120s para herramientas lentas (ScraperRalf ~67s)
-                max_retries=3,
-                model_kwargs={
-                    # Forzar uso de herramientas cuando estén disponibles
-                    # Esto previene que el LLM invente datos en lugar de usar tools
-                    "tool_choice": "auto",  # auto permite que use tools cuando sea apropiado
-                },
-            )
-
-            # Verificar configuración
-            logger.info(f"🔍 OPENAI_API_BASE={os.getenv('OPENAI_API_BASE')}")
-
-            logger.info(f"✅ LLM instanciado correctamente (temp={temp})")
-            return llm
-
-        except Exception as e:
-            logger.error(f"❌ Error al crear instancia LLM: {e}")
-            raise
+
+@lru_cache(maxsize=16)
+def _build_llm(
+    base_url: str, api_key: str, model_name: str, temp: float, max_tokens: int
+) -> ChatOpenAI:
+    """
+    Construye el cliente ChatOpenAI (solo una vez por combinación de parámetros).
+    """
+    try:
+        logger.info("🔧 Creando LLM con base_url=%s, model=%s", base_url, model_name)
+
+        llm = ChatOpenAI(
+            openai_api_base=base_url,  # Parámetro legacy
+            base_url=base_url,  # Parámetro moderno
+            api_key=api_key,  # type: ignore
+            model=model_name,
+            temperature=temp,
+            max_tokens=max_tokens,
+            timeout=120,  # Aumentado de 60 a 120s para herramientas lentas (ScraperRalf ~67s)
+            max_retries=3,
+            http_client=_http_client,
+            model_kwargs={
+                # Forzar uso de herramientas cuando estén disponibles
+                # Esto previene que el LLM invente datos en lugar de usar tools
+                "tool_choice": "auto",  # auto permite que use tools cuando sea apropiado
+            },
+        )
+
+        logger.info("✅ LLM instanciado correctamente (temp=%s)", temp)
+        return llm
+
+    except Exception as e:
+        logger.error("❌ Error al crear instancia LLM: %s", e)
+        raise
 
 
 # Singleton para reutilización
@@ -0,0 +1,6 @@
+"""
+Plantillas de texto de las tareas de la crew.
+
+Se cargan una sola vez al importar src.crew (importlib.resources); los
+marcadores {current_date}, {topic}, etc. se rellenan con str.format_map.
+"""
@@ -0,0 +1,168 @@
+"""
+=============================================================================
+MÓDULO: Almacenamiento de Sesiones y Resultados
+=============================================================================
+
+Guarda el estado de cada sesión de generación y el artículo resultante,
+con expiración automática para que la memoria no crezca indefinidamente.
+
+ARQUITECTURA:
+- RedisSessionStore: compartido entre workers, sobrevive a reinicios
+  * sess:<id>  → hash con topic/status/started_at/... (TTL 1h)
+  * res:<id>   → resultado serializado en JSON (TTL 24h)
+  * sess:index → sorted set por timestamp para limitar el nº de sesiones
+- MemorySessionStore: fallback en proceso cuando no hay REDIS_URL (desarrollo),
+  acotado a MAX_SESSIONS con desalojo LRU
+
+CONFIGURACIÓN RECOMENDADA DE REDIS:
+    maxmemory 512mb
+    maxmemory-policy allkeys-lru
+"""
+
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL = int(os.getenv("SESSION_TTL", "3600"))  # segundos
+RESULT_TTL = int(os.getenv("RESULT_TTL", "86400"))  # segundos
+MAX_SESSIONS = int(os.getenv("MAX_SESSIONS", "10000"))
+
+_INDEX_KEY = "sess:index"
+
+# Actualiza el hash solo si la sesión sigue existiendo (atómico en Redis): una
+# sesión expirada o desalojada no se recrea como registro parcial
+_UPDATE_IF_EXISTS = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+redis.call("HSET", KEYS[1], unpack(ARGV, 2))
+redis.call("EXPIRE", KEYS[1], ARGV[1])
+return 1
+"""
+
+
+class RedisSessionStore:
+    """
+    Almacén de sesiones respaldado por Redis con TTL y límite de capacidad.
+
+    El índice `sess:index` ordena las sesiones por antigüedad; al superar
+    MAX_SESSIONS se descartan las más antiguas (desalojo por recencia).
+    """
+
+    def __init__(self, redis_url: str):
+        import redis
+
+        self._redis = redis.Redis.from_url(redis_url, decode_responses=True)
+        self._update_if_exists = self._redis.register_script(_UPDATE_IF_EXISTS)
+        logger.info("🗄️ Sesiones almacenadas en Redis (%s)", redis_url)
+
+    def create_session(self, session_id: str, info: Dict[str, Any]):
+        key = f"sess:{session_id}"
+        pipe = self._redis.pipeline()
+        pipe.hset(key, mapping=info)
+        pipe.expire(key, SESSION_TTL)
+        pipe.zadd(_INDEX_KEY, {session_id: time.time()})
+        pipe.execute()
+        self._evict()
+
+    def update_session(self, session_id: str, **fields: Any):
+        args = [SESSION_TTL]
+        for field, value in fields.items():
+            args += (field, value)
+        self._update_if_exists(keys=[f"sess:{session_id}"], args=args)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self._redis.hgetall(f"sess:{session_id}") or None
+
+    def set_result(self, session_id: str, result: Dict[str, Any]):
+        self._redis.set(f"res:{session_id}", json.dumps(result), ex=RESULT_TTL)
+
+    def get_result(self, session_id: str) -> Optional[Dict[str, Any]]:
+        raw = self._redis.get(f"res:{session_id}")
+        return json.loads(raw) if raw else None
+
+    def count(self) -> int:
+        # Purgar del índice las sesiones cuyo hash ya expiró por TTL
+        self._redis.zremrangebyscore(_INDEX_KEY, 0, time.time() - SESSION_TTL)
+        return self._redis.zcard(_INDEX_KEY)
+
+    def _evict(self):
+        """Descarta las sesiones más antiguas por encima de MAX_SESSIONS."""
+        overflow = self._redis.zcard(_INDEX_KEY) - MAX_SESSIONS
+        if overflow <= 0:
+            return
+
+        stale = self._redis.zrange(_INDEX_KEY, 0, overflow - 1)
+        pipe = self._redis.pipeline()
+        for session_id in stale:
+            pipe.delete(f"sess:{session_id}", f"res:{session_id}")
+        pipe.zremrangebyrank(_INDEX_KEY, 0, overflow - 1)
+        pipe.execute()
+
+
+class MemorySessionStore:
+    """
+    Almacén en memoria del proceso (solo para desarrollo, un único worker).
+
+    Las sesiones y resultados se guardan en OrderedDicts acotados a
+    MAX_SESSIONS: al superar el límite se descarta la entrada menos reciente.
+    El lock protege las escrituras desde la crew en background frente a las
+    lecturas de los handlers HTTP/Socket.IO.
+    """
+
+    def __init__(self, max_sessions: int = MAX_SESSIONS):
+        self._sessions: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._results: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._max_sessions = max_sessions
+        self._lock = Lock()
+        logger.info("🗄️ Sesiones almacenadas en memoria (sin REDIS_URL)")
+
+    def _put(self, store: "OrderedDict[str, Dict[str, Any]]", key: str, value):
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self._max_sessions:
+            store.popitem(last=False)
+
+    def create_session(self, session_id: str, info: Dict[str, Any]):
+        with self._lock:
+            self._put(self._sessions, session_id, dict(info))
+
+    def update_session(self, session_id: str, **fields: Any):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:  # Expirada o desalojada: no se recrea
+                return
+            session.update(fields)
+            self._put(self._sessions, session_id, session)
+
+    def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            session = self._sessions.get(session_id)
+            return dict(session) if session is not None else None
+
+    def set_result(self, session_id: str, result: Dict[str, Any]):
+        with self._lock:
+            self._put(self._results, session_id, result)
+
+    def get_result(self, session_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._results.get(session_id)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+
+def create_session_store(redis_url: Optional[str] = None):
+    """
+    Factory: usa Redis si hay URL configurada, memoria en caso contrario.
+    """
+    if redis_url:
+        return RedisSessionStore(redis_url)
+    return MemorySessionStore()
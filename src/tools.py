@@ -17,13 +17,22 @@ ARQUITECTURA:
 - Manejo robusto de errores y timeouts
 """
 
+import atexit
 import os
+import sys
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from threading import Lock
 import requests
-from typing import Type, Optional, List, Dict, Any, TYPE_CHECKING
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Type, Optional, List, Dict, Any, Tuple, TYPE_CHECKING
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import logging
-import json
+import msgspec
 
 # Importar BaseTool - priorizar crewai.tools
 try:
@@ -31,14 +40,209 @@ try:
 except ImportError:
     from crewai_tools import BaseTool  # type: ignore[import]
 
-# Configurar logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Cargar variables de entorno
 load_dotenv()
 
 
+# =============================================================================
+# SESIÓN HTTP COMPARTIDA (keep-alive y reintentos, una por proceso)
+# =============================================================================
+# Las llamadas a ScraperRalf tardan ~60-90s de pura espera de red. Se hacen
+# con una requests.Session compartida (pool de conexiones keep-alive), como
+# en ralf_proxy.py. Bajo eventlet (app.py aplica monkey_patch) sus sockets son
+# verdes: cada búsqueda solo suspende su greenlet, así que N búsquedas
+# concurrentes cuestan ~max(t) sin hilos nativos ni un event loop aparte.
+
+# Lectura hasta 90s para permitir que scrapers locales completen
+# (Infobae con browser automation puede tardar 60-90s); el handshake TCP
+# falla a los 3s si ScraperRalf está caído
+_SCRAPER_CONNECT_TIMEOUT = 3
+_SCRAPER_TIMEOUT = (_SCRAPER_CONNECT_TIMEOUT, 90)
+# Un lote filtra varias consultas sobre la misma ejecución de las fuentes
+_SCRAPER_BATCH_TIMEOUT = (_SCRAPER_CONNECT_TIMEOUT, 120)
+# Accept-Encoding lo genera requests (gzip, deflate y br si Brotli está
+# instalado, vía urllib3[brotli]) y urllib3 descomprime de forma transparente
+_SCRAPER_HEADERS = {
+    "User-Agent": "MultiAgent-NewsSystem/1.0",
+    "Accept": "application/json",
+}
+
+# Reintentos ante errores transitorios del gateway (502/503/504) con backoff
+# exponencial sobre la misma conexión keep-alive. Los errores de conexión y
+# de lectura no se reintentan: ScraperRalf caído debe fallar rápido
+_SCRAPER_RETRIES = 2
+_SCRAPER_BACKOFF = 0.3  # segundos
+_scraper_retry = Retry(
+    total=_SCRAPER_RETRIES,
+    connect=0,
+    read=False,  # Propaga ReadTimeout tal cual (requests.Timeout)
+    backoff_factor=_SCRAPER_BACKOFF,
+    status_forcelist=(502, 503, 504),
+    raise_on_status=False,  # Devolver la última respuesta para reportar el error
+)
+
+# Conexiones keep-alive por host (y búsquedas individuales simultáneas de un lote)
+_SCRAPER_POOL_SIZE = 20
+
+_session = requests.Session()
+_session.headers.update(_SCRAPER_HEADERS)
+_adapter = HTTPAdapter(pool_maxsize=_SCRAPER_POOL_SIZE, max_retries=_scraper_retry)
+_session.mount("http://", _adapter)
+_session.mount("https://", _adapter)
+atexit.register(_session.close)
+
+# POST /api/search_batch no forma parte del contrato estándar de ScraperRalf:
+# solo se usa si se activa explícitamente. Si el servidor responde que no lo
+# soporta (404/405/501) se recuerda y no se vuelve a intentar en este proceso
+SCRAPER_BATCH_ENABLED = (
+    os.getenv("SCRAPER_BATCH_ENABLED", "False").lower() == "true"
+)
+_batch_supported = SCRAPER_BATCH_ENABLED
+
+# Clasificación de fuentes por tier (calidad de contenido)
+DEEP_SOURCES = frozenset({"La República", "El Comercio", "Infobae"})
+API_SOURCES = frozenset({"NewsAPI", "TheNewsAPI"})
+# Clave Optional: 'source' puede venir null en la respuesta
+_SOURCE_TIERS: Dict[Optional[str], str] = {
+    **dict.fromkeys(DEEP_SOURCES, "deep"),
+    **dict.fromkeys(API_SOURCES, "api"),
+}
+
+
+
+class _ScrapedArticle(msgspec.Struct):
+    """Artículo de ScraperRalf; los defaults reemplazan los .get(..., default)."""
+
+    title: Optional[str] = "Sin título"
+    content: Optional[str] = None
+    source: Optional[str] = "Fuente desconocida"
+    url: Optional[str] = ""
+    date: Optional[str] = ""
+    method: Optional[str] = "unknown"
+    # Consulta a la que corresponde el artículo en una búsqueda por lotes
+    query: Optional[str] = None
+
+
+class _ScraperResponse(msgspec.Struct):
+    # Sin default: una respuesta sin 'results' es un ValidationError
+    results: List[_ScrapedArticle]
+
+
+# Decodificación + validación + extracción de campos en una pasada en C
+_RESPONSE_DECODER = msgspec.json.Decoder(_ScraperResponse)
+# JSON compacto para los agentes: sin indentación ahorra ~20% de tokens
+_ENCODER = msgspec.json.Encoder()
+
+# Separadores de los banners de consola
+_BANNER = "=" * 100
+_LOG_RULE = "=" * 80
+
+# Cache de búsquedas por (query normalizada, max_results): LRU acotada con la
+# última respuesta formateada, su ETag y cuándo se obtuvo. Dentro del TTL se
+# sirve directamente; pasado el TTL se revalida con If-None-Match y un 304 de
+# ScraperRalf la reutiliza sin cuerpo ni re-parseo
+SCRAPER_CACHE_TTL = float(os.getenv("SCRAPER_CACHE_TTL", "300"))  # segundos
+SCRAPER_CACHE_MAX_ENTRIES = int(os.getenv("SCRAPER_CACHE_MAX_ENTRIES", "256"))
+_search_cache: "OrderedDict[Tuple[str, int], Tuple[float, Optional[str], str]]" = (
+    OrderedDict()
+)
+_search_cache_lock = Lock()
+
+def _search_cache_get(
+    key: Tuple[str, int]
+) -> Optional[Tuple[float, Optional[str], str]]:
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is not None:
+            _search_cache.move_to_end(key)
+        return entry
+
+
+def _search_cache_put(key: Tuple[str, int], etag: Optional[str], payload: str):
+    with _search_cache_lock:
+        _search_cache[key] = (time.monotonic(), etag, payload)
+        _search_cache.move_to_end(key)
+        while len(_search_cache) > SCRAPER_CACHE_MAX_ENTRIES:
+            _search_cache.popitem(last=False)
+
+
+def _decode_response(body: bytes) -> _ScraperResponse:
+    """
+    Decodifica y valida la respuesta en una sola pasada en C. Si algún
+    artículo no tiene la forma esperada se valida artículo por artículo y
+    solo se descartan los inválidos (lanza msgspec.ValidationError si falta
+    'results').
+    """
+    try:
+        return _RESPONSE_DECODER.decode(body)
+    except msgspec.ValidationError:
+        data = msgspec.json.decode(body)
+        if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+            raise
+
+    results: List[_ScrapedArticle] = []
+    for item in data["results"]:
+        try:
+            results.append(msgspec.convert(item, _ScrapedArticle))
+        except msgspec.ValidationError:
+            pass
+    logger.warning(
+        "⚠️ %d artículo(s) de ScraperRalf con formato inválido descartados",
+        len(data["results"]) - len(results),
+    )
+    return _ScraperResponse(results=results)
+
+
+def _fetch_json(
+    endpoint: str, params: Dict[str, Any], etag: Optional[str] = None
+) -> Tuple[Optional[str], Optional[_ScraperResponse]]:
+    """
+    GET + parseo JSON en la sesión compartida (lanza HTTPError si != 2xx).
+
+    Retorna (etag, datos). Si se pasa `etag` se envía como If-None-Match y un
+    304 se retorna como (etag, None) sin cuerpo.
+    """
+    headers = {"If-None-Match": etag} if etag else None
+    response = _session.get(
+        endpoint, params=params, headers=headers, timeout=_SCRAPER_TIMEOUT
+    )
+    response.raise_for_status()
+    if response.status_code == 304:
+        return etag, None
+    return response.headers.get("ETag"), _decode_response(response.content)
+
+
+def _fetch_batch(
+    base_url: str, queries: List[str], max_results: int
+) -> Optional[_ScraperResponse]:
+    """
+    Varias consultas en una sola llamada a /api/search_batch (ScraperRalf
+    ejecuta sus fuentes una vez); cada artículo trae su `query`.
+
+    Retorna None si el servidor no expone el endpoint (404/405/501); se
+    recuerda y no se vuelve a intentar en este proceso.
+    """
+    global _batch_supported
+    response = _session.post(
+        f"{base_url}/api/search_batch",
+        data=_ENCODER.encode({"queries": queries, "max_results": max_results}),
+        headers={"Content-Type": "application/json"},
+        timeout=_SCRAPER_BATCH_TIMEOUT,
+    )
+    if response.status_code in (404, 405, 501):
+        _batch_supported = False
+        logger.warning(
+            "↪️ ScraperRalf sin /api/search_batch (%s): se usarán búsquedas "
+            "individuales",
+            response.status_code,
+        )
+        return None
+    response.raise_for_status()
+    return _decode_response(response.content)
+
+
 class NewsSearchInput(BaseModel):
     """
     Esquema de entrada para la herramienta de búsqueda de noticias.
@@ -57,6 +261,10 @@ class NewsSearchInput(BaseModel):
     max_results: int = Field(
         default=5, description="Número máximo de resultados a retornar (1-20)"
     )
+    queries: Optional[List[str]] = Field(
+        default=None,
+        description="Consultas adicionales a resolver en la misma llamada",
+    )
 
 
 class NewsSearchTool(BaseTool):  # type: ignore[misc]
@@ -79,7 +287,13 @@ class NewsSearchTool(BaseTool):  # type: ignore[misc]
         "Busca noticias y artículos en fuentes confiables mediante la API ScraperRalf. "
         "Usa esta herramienta cuando necesites información actualizada sobre un tema específico. "
         "Retorna título, contenido y fuente de cada artículo encontrado. "
-        "IMPORTANTE: Siempre verifica la calidad de las fuentes antes de usar la información."
+        # Agrupar consultas solo ahorra tiempo si ScraperRalf las resuelve en lote
+        + (
+            "Si necesitas varias búsquedas, pásalas juntas en `queries`. "
+            if SCRAPER_BATCH_ENABLED
+            else ""
+        )
+        + "IMPORTANTE: Siempre verifica la calidad de las fuentes antes de usar la información."
     )
     args_schema: Type[BaseModel] = NewsSearchInput
 
@@ -90,14 +304,29 @@ class NewsSearchTool(BaseTool):  # type: ignore[misc]
     default_max_results: int = Field(
         default_factory=lambda: int(os.getenv("SCRAPER_MAX_RESULTS", "5"))
     )
+    # Presupuesto de contenido devuelto al LLM (0 = sin límite); el texto
+    # completo sigue accesible en `url` y `content_length` es la longitud real
+    max_content_chars: int = Field(
+        default_factory=lambda: int(os.getenv("SCRAPER_MAX_CONTENT_CHARS", "2000"))
+    )
+    max_total_chars: int = Field(
+        default_factory=lambda: int(os.getenv("SCRAPER_MAX_TOTAL_CHARS", "40000"))
+    )
 
-    def _run(self, query: str, max_results: Optional[int] = None) -> str:
+    def _run(
+        self,
+        query: str,
+        max_results: Optional[int] = None,
+        queries: Optional[List[str]] = None,
+    ) -> str:
         """
         Ejecuta la búsqueda de noticias.
 
         Args:
             query: Consulta de búsqueda
             max_results: Límite de resultados (usa default si no se especifica)
+            queries: Consultas adicionales; sus resultados se combinan y cada
+                artículo indica su `query`
 
         Returns:
             String JSON con resultados estructurados o mensaje de error
@@ -112,224 +341,317 @@ class NewsSearchTool(BaseTool):  # type: ignore[misc]
         # Validar rango de max_results
         max_results = max(1, min(max_results, 20))
 
-        import time
-        from datetime import datetime
+        # Lote de consultas distintas (sin repetir la principal)
+        batch = list(dict.fromkeys([query, *queries])) if queries else []
+        if len(batch) > 1:
+            query_label = " | ".join(batch)
+        else:
+            batch, query_label = [], query
+
+        # Sin /api/search_batch cada consulta pasa por la búsqueda individual
+        if batch and not _batch_supported:
+            return self._run_each(batch, max_results)
+
+        # Búsqueda repetida dentro del TTL: se responde sin tocar la red
+        cache_key = (query_label.strip().casefold(), max_results)
+        cached = _search_cache_get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] <= SCRAPER_CACHE_TTL:
+            logger.info("⚡ Búsqueda servida desde cache: %r", cache_key)
+            return cached[2]
 
-        start_time = time.time()
-        start_datetime = datetime.now().strftime("%H:%M:%S")
+        # Los banners solo se construyen si el nivel INFO está activo
+        verbose = logger.isEnabledFor(logging.INFO)
 
         # LOGGING EXTREMADAMENTE VISIBLE
-        print("\n" + "=" * 100)
-        print("🔴🔴🔴 INVESTIGADOR LLAMÓ A LA HERRAMIENTA NewsSearchTool 🔴🔴🔴")
-        print("=" * 100)
-        logger.info(f"\n{'='*80}")
-        logger.info(f"🔎 INICIO BÚSQUEDA: '{query}' (max: {max_results} por fuente)")
-        logger.info(f"⏱️ Timestamp: {start_datetime}")
-        logger.info(
-            f"⚠️ ESTA OPERACIÓN TARDARÁ ~60-70 SEGUNDOS - EL INVESTIGADOR DEBE ESPERAR"
-        )
-        logger.info(f"{'='*80}\n")
+        if verbose:
+            start_time = time.monotonic()
+            start_datetime = datetime.now().strftime("%H:%M:%S")
+            sys.stdout.write(
+                f"\n{_BANNER}\n"
+                "🔴🔴🔴 INVESTIGADOR LLAMÓ A LA HERRAMIENTA NewsSearchTool 🔴🔴🔴\n"
+                f"{_BANNER}\n"
+            )
+            logger.info("\n%s", _LOG_RULE)
+            logger.info(
+                "🔎 INICIO BÚSQUEDA: '%s' (max: %d por fuente)",
+                query_label,
+                max_results,
+            )
+            logger.info("⏱️ Timestamp: %s", start_datetime)
+            logger.info(
+                "⚠️ ESTA OPERACIÓN TARDARÁ ~60-70 SEGUNDOS - EL INVESTIGADOR DEBE ESPERAR"
+            )
+            logger.info("%s\n", _LOG_RULE)
 
-        print(
-            f"⏳ ESPERANDO RESPUESTA DE SCRAPERRALF... (esto puede tardar 60-70 segundos)"
-        )
-        print(f"🚫 EL INVESTIGADOR NO DEBE CONTINUAR HASTA QUE ESTO COMPLETE")
-        print("=" * 100 + "\n")
+            sys.stdout.write(
+                "⏳ ESPERANDO RESPUESTA DE SCRAPERRALF... (esto puede tardar 60-70 segundos)\n"
+                "🚫 EL INVESTIGADOR NO DEBE CONTINUAR HASTA QUE ESTO COMPLETE\n"
+                f"{_BANNER}\n\n"
+            )
 
         try:
             # Construcción de la petición
             endpoint = f"{self.base_url}/api/search"
             params = {"q": query, "max_results": max_results}
 
-            # Timeout de 90s para permitir que scrapers locales completen
-            # (Infobae con browser automation puede tardar 60-90s)
             # ScraperRalf ejecuta las 5 fuentes en paralelo:
             # - APIs globales (NewsAPI, TheNewsAPI): ~3-5s
             # - El Comercio (JSON-LD): ~30-45s
             # - La República (CSS): ~45-60s
             # - Infobae (Camoufox): ~60-90s
-            response = requests.get(
-                endpoint,
-                params=params,
-                timeout=90,  # Timeout aumentado para contenido completo
-                headers={"User-Agent": "MultiAgent-NewsSystem/1.0"},
-            )
-
-            # Verificar código de estado
-            response.raise_for_status()
-
-            # Parsear respuesta
-            data = response.json()
-
-            elapsed_time = time.time() - start_time
-            end_datetime = datetime.now().strftime("%H:%M:%S")
-
-            # LOGGING EXTREMADAMENTE VISIBLE
-            print("\n" + "=" * 100)
-            print(
-                "🟢🟢🟢 HERRAMIENTA COMPLETADA - DATOS RECIBIDOS DE SCRAPERRALF 🟢🟢🟢"
-            )
-            print("=" * 100)
-            logger.info(f"\n{'='*80}")
-            logger.info(f"✅ RESPUESTA RECIBIDA en {elapsed_time:.2f} segundos")
-            logger.info(f"⏱️ Inicio: {start_datetime} → Fin: {end_datetime}")
-            logger.info(f"{'='*80}\n")
-            print(f"⏱️ Tiempo de espera: {elapsed_time:.2f} segundos")
-            print(f"✅ EL INVESTIGADOR AHORA TIENE LOS DATOS COMPLETOS")
-            print("=" * 100 + "\n")
-
-            # Validar estructura de respuesta
-            if "results" not in data:
-                logger.warning("⚠️ Respuesta sin campo 'results'")
-                return json.dumps(
-                    {
-                        "status": "error",
-                        "message": "Formato de respuesta inválido de ScraperRalf",
-                        "results": [],
-                    }
+            if batch:
+                etag = None
+                data = _fetch_batch(self.base_url, batch, max_results)
+                if data is None:
+                    return self._run_each(batch, max_results)
+            else:
+                etag, data = _fetch_json(
+                    endpoint, params, cached[1] if cached else None
                 )
 
-            results = data["results"]
-            logger.info(f"📦 Total de artículos recibidos: {len(results)}")
-
-            # Contar artículos por tier
-            deep_sources = sum(
-                1
-                for r in results
-                if r.get("source") in ["La República", "El Comercio", "Infobae"]
-            )
-            api_sources = sum(
-                1 for r in results if r.get("source") in ["NewsAPI", "TheNewsAPI"]
-            )
-
-            logger.info(f"\n📊 ANÁLISIS DE DISTRIBUCIÓN POR TIER:")
-            logger.info(
-                f"   🟢 TIER 1 (Fuentes Locales/Deep): {deep_sources} artículos"
-            )
-            logger.info(f"   🟡 TIER 2 (APIs Globales): {api_sources} artículos")
-
-            # Análisis de longitud de contenido
-            if deep_sources > 0:
-                deep_articles = [
-                    r
-                    for r in results
-                    if r.get("source") in ["La República", "El Comercio", "Infobae"]
-                ]
-                avg_length = sum(
-                    len(r.get("content", "")) for r in deep_articles
-                ) / len(deep_articles)
-                total_chars = sum(len(r.get("content", "")) for r in deep_articles)
-                logger.info(
-                    f"   📏 Longitud promedio Tier 1: {avg_length:.0f} caracteres"
+            # LOGGING EXTREMADAMENTE VISIBLE
+            if verbose:
+                elapsed_time = time.monotonic() - start_time
+                end_datetime = datetime.now().strftime("%H:%M:%S")
+                sys.stdout.write(
+                    f"\n{_BANNER}\n"
+                    "🟢🟢🟢 HERRAMIENTA COMPLETADA - DATOS RECIBIDOS DE SCRAPERRALF 🟢🟢🟢\n"
+                    f"{_BANNER}\n"
                 )
-                logger.info(
-                    f"   📝 Total de contenido Tier 1: {total_chars:,} caracteres"
+                logger.info("\n%s", _LOG_RULE)
+                logger.info("✅ RESPUESTA RECIBIDA en %.2f segundos", elapsed_time)
+                logger.info("⏱️ Inicio: %s → Fin: %s", start_datetime, end_datetime)
+                logger.info("%s\n", _LOG_RULE)
+                sys.stdout.write(
+                    f"⏱️ Tiempo de espera: {elapsed_time:.2f} segundos\n"
+                    "✅ EL INVESTIGADOR AHORA TIENE LOS DATOS COMPLETOS\n"
+                    f"{_BANNER}\n\n"
                 )
 
-            if api_sources > 0:
-                api_articles = [
-                    r for r in results if r.get("source") in ["NewsAPI", "TheNewsAPI"]
-                ]
-                avg_length_api = sum(
-                    len(r.get("content", "")) for r in api_articles
-                ) / len(api_articles)
-                logger.info(
-                    f"   📏 Longitud promedio Tier 2: {avg_length_api:.0f} caracteres"
-                )
+            # 304 Not Modified: los resultados formateados siguen vigentes
+            # (solo ocurre al revalidar una entrada de la cache)
+            if data is None:
+                assert cached is not None
+                logger.info("♻️ ScraperRalf sin cambios (304), se reutiliza la respuesta")
+                _search_cache_put(cache_key, etag, cached[2])
+                return cached[2]
 
-            logger.info(f"")
+            results = data.results
+            logger.info("📦 Total de artículos recibidos: %d", len(results))
 
-            # Formatear resultados para consumo del agente
+            # Una sola pasada: clasificar por tier, acumular conteos y
+            # longitudes y formatear los resultados para el agente
             formatted_results = []
+            deep_sources = api_sources = 0
+            deep_chars = api_chars = 0
+            max_content = self.max_content_chars
+            budget = self.max_total_chars or None
             for idx, item in enumerate(results, 1):
-                # Clasificar fuentes por tier (calidad de contenido)
-                source = item.get("source", "Fuente desconocida")
-                content = item.get("content", "Sin contenido")
+                source = item.source
+                content = item.content
+                if content is None:
+                    content = "Sin contenido"
+                    content_chars = 0
+                else:
+                    content_chars = len(content)
 
                 # Tier 1: Fuentes locales con contenido completo
-                is_deep_source = source in ["La República", "El Comercio", "Infobae"]
-
                 # Tier 2: APIs globales con snippets
-                is_api_source = source in ["NewsAPI", "TheNewsAPI"]
-
-                formatted_results.append(
-                    {
-                        "id": idx,
-                        "title": item.get("title", "Sin título"),
-                        "content": content,
-                        "source": source,
-                        "url": item.get("url", ""),
-                        "date": item.get("date", ""),
-                        "tier": (
-                            "deep"
-                            if is_deep_source
-                            else ("api" if is_api_source else "unknown")
-                        ),
-                        "content_length": len(content),
-                        "extraction_method": item.get("method", "unknown"),
-                    }
-                )
+                tier = _SOURCE_TIERS.get(source, "unknown")
+                if tier == "deep":
+                    deep_sources += 1
+                    deep_chars += content_chars
+                elif tier == "api":
+                    api_sources += 1
+                    api_chars += content_chars
+
+                # Recorte por artículo y por presupuesto total
+                if max_content and content_chars > max_content:
+                    content = content[:max_content] + "…"
+                if budget is not None:
+                    if len(content) > budget:
+                        content = content[:budget] + "…"
+                    budget = max(0, budget - len(content))
+
+                formatted = {
+                    "id": idx,
+                    "title": item.title,
+                    "content": content,
+                    "source": source,
+                    "url": item.url,
+                    "date": item.date,
+                    "tier": tier,
+                    "content_length": content_chars,
+                    "extraction_method": item.method,
+                }
+                if item.query is not None:
+                    formatted["query"] = item.query
+                formatted_results.append(formatted)
 
-            return json.dumps(
+            if verbose:
+                logger.info("\n📊 ANÁLISIS DE DISTRIBUCIÓN POR TIER:")
+                logger.info(
+                    "   🟢 TIER 1 (Fuentes Locales/Deep): %d artículos", deep_sources
+                )
+                logger.info("   🟡 TIER 2 (APIs Globales): %d artículos", api_sources)
+
+                # Análisis de longitud de contenido
+                if deep_sources > 0:
+                    logger.info(
+                        "   📏 Longitud promedio Tier 1: %.0f caracteres",
+                        deep_chars / deep_sources,
+                    )
+                    logger.info(
+                        "   📝 Total de contenido Tier 1: %s caracteres",
+                        f"{deep_chars:,}",
+                    )
+
+                if api_sources > 0:
+                    logger.info(
+                        "   📏 Longitud promedio Tier 2: %.0f caracteres",
+                        api_chars / api_sources,
+                    )
+
+                logger.info("")
+
+            payload = _ENCODER.encode(
                 {
                     "status": "success",
-                    "query": query,
+                    "query": query_label,
                     "total_results": len(formatted_results),
-                    "deep_sources_count": sum(
-                        1 for r in formatted_results if r["tier"] == "deep"
-                    ),
-                    "api_sources_count": sum(
-                        1 for r in formatted_results if r["tier"] == "api"
-                    ),
+                    "deep_sources_count": deep_sources,
+                    "api_sources_count": api_sources,
                     "results": formatted_results,
-                },
-                indent=2,
-                ensure_ascii=False,
+                }
+            ).decode()
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("📄 Resultado formateado:\n%s", msgspec.json.format(payload))
+            _search_cache_put(cache_key, etag, payload)
+            return payload
+
+        except requests.ConnectTimeout:
+            error_msg = (
+                f"🔌 ScraperRalf no aceptó la conexión en {_SCRAPER_CONNECT_TIMEOUT}s "
+                f"({self.base_url})"
             )
+            logger.error(error_msg)
+            return _ENCODER.encode(
+                {
+                    "status": "error",
+                    "message": f"ScraperRalf no está disponible. Verifica que el servicio esté corriendo en {self.base_url}",
+                    "results": [],
+                }
+            ).decode()
 
         except requests.Timeout:
             error_msg = f"⏱️ Timeout al conectar con ScraperRalf ({self.base_url})"
             logger.error(error_msg)
-            return json.dumps(
+            return _ENCODER.encode(
                 {
                     "status": "error",
                     "message": "La búsqueda excedió el tiempo límite. Intenta con una consulta más específica.",
                     "results": [],
                 }
-            )
+            ).decode()
 
         except requests.ConnectionError:
             error_msg = f"🔌 No se pudo conectar con ScraperRalf en {self.base_url}"
             logger.error(error_msg)
-            return json.dumps(
+            return _ENCODER.encode(
                 {
                     "status": "error",
                     "message": f"ScraperRalf no está disponible. Verifica que el servicio esté corriendo en {self.base_url}",
                     "results": [],
                 }
-            )
+            ).decode()
+
+        except msgspec.ValidationError as e:
+            # Estructura de respuesta inesperada (p. ej. sin campo 'results')
+            logger.warning("⚠️ Respuesta de ScraperRalf con formato inválido: %s", e)
+            return _ENCODER.encode(
+                {
+                    "status": "error",
+                    "message": "Formato de respuesta inválido de ScraperRalf",
+                    "results": [],
+                }
+            ).decode()
 
         except requests.HTTPError as e:
-            error_msg = f"❌ Error HTTP {e.response.status_code}: {e.response.text}"
+            status = e.response.status_code
+            error_msg = f"❌ Error HTTP {status}: {e.response.reason}"
             logger.error(error_msg)
-            return json.dumps(
+            return _ENCODER.encode(
                 {
                     "status": "error",
-                    "message": f"Error del servidor de búsqueda: {e.response.status_code}",
+                    "message": f"Error del servidor de búsqueda: {status}",
                     "results": [],
                 }
-            )
+            ).decode()
 
         except Exception as e:
             error_msg = f"💥 Error inesperado en NewsSearchTool: {str(e)}"
             logger.error(error_msg)
-            return json.dumps(
+            return _ENCODER.encode(
                 {
                     "status": "error",
                     "message": f"Error interno: {type(e).__name__}",
                     "results": [],
                 }
+            ).decode()
+
+    def _run_each(self, queries: List[str], max_results: int) -> str:
+        """
+        Resuelve cada consulta con la búsqueda individual (cache TTL/ETag
+        incluida) y combina sus resultados; cada artículo indica su `query`.
+
+        Las búsquedas se lanzan a la vez: bajo eventlet los hilos del pool son
+        greenlets, así que el lote cuesta ~max(t) y no la suma.
+        """
+        workers = min(len(queries), _SCRAPER_POOL_SIZE)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            payloads = list(
+                executor.map(lambda q: self._run(q, max_results), queries)
+            )
+
+        results: List[Dict[str, Any]] = []
+        deep_sources = api_sources = 0
+        failed: List[str] = []
+        budget = self.max_total_chars or None
+        for query, payload in zip(queries, payloads):
+            data = msgspec.json.decode(payload)
+            if data["status"] != "success":
+                failed.append(payload)
+                continue
+            deep_sources += data["deep_sources_count"]
+            api_sources += data["api_sources_count"]
+            for item in data["results"]:
+                # El presupuesto total es para el lote, no para cada consulta
+                if budget is not None:
+                    content = item["content"]
+                    if len(content) > budget:
+                        item["content"] = content = content[:budget] + "…"
+                    budget = max(0, budget - len(content))
+                item["id"] = len(results) + 1
+                item["query"] = query
+                results.append(item)
+
+        if failed:
+            logger.warning(
+                "⚠️ %d de %d búsquedas del lote fallaron", len(failed), len(queries)
             )
+            if len(failed) == len(queries):
+                return failed[0]
+
+        return _ENCODER.encode(
+            {
+                "status": "success",
+                "query": " | ".join(queries),
+                "total_results": len(results),
+                "deep_sources_count": deep_sources,
+                "api_sources_count": api_sources,
+                "results": results,
+            }
+        ).decode()
 
 
 class FactCheckInput(BaseModel):
@@ -364,14 +686,14 @@ class FactCheckTool(BaseTool):  # type: ignore[misc]
         Placeholder: En producción, conectaría con fact-checking API.
         """
         logger.warning("⚠️ FactCheckTool aún no implementada. Retornando placeholder.")
-        return json.dumps(
+        return _ENCODER.encode(
             {
                 "status": "not_implemented",
                 "message": "Sistema de fact-checking en desarrollo. Usa análisis manual por ahora.",
                 "statement": statement,
                 "verdict": "requires_manual_review",
             }
-        )
+        ).decode()
 
 
 # Factory function para instanciar herramientas
@@ -396,6 +718,7 @@ if __name__ == "__main__":
     """
     Test de integración con ScraperRalf.
     """
+    logging.basicConfig(level=logging.INFO)
     print("🧪 Probando NewsSearchTool...\n")
 
     tool = get_news_search_tool()
@@ -404,11 +727,11 @@ if __name__ == "__main__":
     result = tool._run("inteligencia artificial", max_results=3)
     print("📰 Resultado de búsqueda:")
     print(result)
-    print("\n" + "=" * 80 + "\n")
+    print("\n" + _LOG_RULE + "\n")
 
     # Parsear resultado para verificar
     try:
-        data = json.loads(result)
+        data = msgspec.json.decode(result)
         if data["status"] == "success":
             print(f"✅ Test exitoso: {data['total_results']} artículos encontrados")
         else:
@@ -0,0 +1,45 @@
+"""
+=============================================================================
+COLA DE TAREAS: Ejecución de la crew en workers Celery
+=============================================================================
+
+Saca la ejecución de la crew del proceso web: el endpoint /api/generate solo
+encola la tarea y retorna el session_id. Los workers Celery ejecutan la crew
+y emiten los eventos Socket.IO a través de la cola de mensajes de Redis, que
+los workers web reenvían a los navegadores conectados.
+
+Se activa con CELERY_ENABLED=True (requiere REDIS_URL).
+
+Uso:
+    celery -A tasks worker -P eventlet --concurrency 8
+"""
+
+import os
+from celery import Celery
+from dotenv import load_dotenv
+
+load_dotenv()
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+celery = Celery("multiagent_news", broker=REDIS_URL)
+celery.conf.update(
+    task_acks_late=True,  # Re-entregar la tarea si el worker muere a mitad
+    worker_prefetch_multiplier=1,  # Las tareas duran minutos: no acaparar
+)
+
+
+@celery.task(name="run_crew_task")
+def run_crew_task(topic: str, session_id: str, current_date: str):
+    """
+    Ejecuta la crew para una sesión dentro del worker Celery.
+
+    Args:
+        topic: Tema de la noticia
+        session_id: ID de la sesión
+        current_date: Fecha de referencia (YYYY-MM-DD)
+    """
+    # Importación diferida: solo el worker carga la app y la crew
+    from app import run_crew_async
+
+    run_crew_async(topic, session_id, current_date)